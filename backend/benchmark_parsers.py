@@ -0,0 +1,147 @@
+"""
+HTML Parser Benchmark
+Measures products parsed per second and peak parse memory for each HTML retailer, per
+BeautifulSoup tree builder and with partial (product grid only) or full page parsing,
+on pages recorded in a crawl cassette (no network needed)
+
+HOW TO USE:
+1. Record a crawl: SCRAPER_CASSETTE_MODE=record python main.py  (then pick a site or ALL)
+2. Run: python backend/benchmark_parsers.py [cassette.zip] [--parsers html.parser,lxml] [--modes partial,full] [--repeat 3]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+import zipfile
+from typing import Callable, Dict, List
+
+import httpx
+
+import scraper
+from fetcher import CASSETTE_PATH, get_host
+
+
+def load_recorded_pages(path) -> Dict[str, httpx.Response]:
+    """Every 200 response in the cassette, keyed by URL"""
+    pages = {}
+    with zipfile.ZipFile(path, "r") as archive:
+        for name in archive.namelist():
+            if not name.endswith(".json"):
+                continue
+            entry = json.loads(archive.read(name))
+            if entry["status_code"] != 200:
+                continue
+            body = archive.read(name[:-len(".json")] + ".body")
+            pages[entry["url"]] = httpx.Response(
+                200, headers={"Content-Type": entry.get("content_type", "")}, content=body,
+                request=httpx.Request("GET", entry["url"]),
+            )
+    return pages
+
+
+class RecordedPages:
+    """Stands in for a crawl context, answering get() from the recorded pages (404 when missing)"""
+
+    def __init__(self, pages: Dict[str, httpx.Response]):
+        self.pages = pages
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.pages.get(url) or httpx.Response(404, request=httpx.Request("GET", url))
+
+
+def parse_kolshzin_pages(pages: List[httpx.Response]) -> int:
+    return sum(len([scraper.parse_kolshzin_grid_item(p) for p in scraper.get_kolshzin_grid_items(res)]) for res in pages)
+
+
+def parse_kolshzin_laptop_pages(pages: List[httpx.Response]) -> int:
+    return sum(len(scraper.extract_kolshzin_products_from_page(scraper.make_soup(res.content, scraper.KOLSHZIN_LISTING), is_laptop=True)) for res in pages)
+
+
+def parse_3diraq_pages(pages: List[httpx.Response]) -> int:
+    return sum(len([scraper.parse_3diraq_card(p) for p in scraper.get_3diraq_product_cards(res)]) for res in pages)
+
+
+def parse_galaxyiq_pages(pages: List[httpx.Response]) -> int:
+    return sum(len([scraper.parse_galaxyiq_product(div, "") for div in scraper.get_galaxyiq_product_divs(res)]) for res in pages)
+
+
+def parse_almanjam_pages(pages: List[httpx.Response]) -> int:
+    # Almanjam parsing lives inside the category walk, so each recorded type is walked again
+    recorded = RecordedPages({str(res.request.url): res for res in pages})
+    return sum(len(scraper.scrape_almanjam_category(category_type, crawl_context=recorded)) for category_type in scraper.ALMANJAM_CATEGORIES)
+
+
+# Retailer -> (does a recorded URL belong to it, parse a list of its pages and return the product count)
+RETAILERS: Dict[str, tuple] = {
+    "kolshzin": (lambda url: get_host(url) == get_host(scraper.BASE_URL_KOLSHZIN) and "_ajax_get_product" in url, parse_kolshzin_pages),
+    "kolshzin-laptops": (lambda url: get_host(url) == get_host(scraper.BASE_URL_KOLSHZIN) and "/product-category/laptops/" in url and "_ajax_get_product" not in url, parse_kolshzin_laptop_pages),
+    "3d-iraq": (lambda url: get_host(url) == get_host(scraper.BASE_URL_3DIRAQ), parse_3diraq_pages),
+    "galaxyiq": (lambda url: get_host(url) == get_host(scraper.BASE_URL_GALAXYIQ) and "/product-categories/" in url, parse_galaxyiq_pages),
+    "almanjam": (lambda url: get_host(url) == get_host(scraper.BASE_URL_ALMANJAM) and "/search" in url, parse_almanjam_pages),
+}
+
+
+def time_parse(parse: Callable[[List[httpx.Response]], int], pages: List[httpx.Response], repeat: int) -> tuple:
+    """(products per pass, best seconds of `repeat` passes, peak KB allocated while parsing)"""
+    best = None
+    products = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        products = parse(pages)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    # Memory is measured in a separate pass, since tracing slows parsing down
+    tracemalloc.start()
+    parse(pages)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return products, best, peak / 1024
+
+
+def run_benchmark(path, parsers: List[str], modes: List[str] = ("partial", "full"), repeat: int = 3) -> List[Dict]:
+    """Products/second and peak memory per retailer, parser and mode on the pages recorded at path"""
+    recorded = load_recorded_pages(path)
+    results = []
+    original_parser, original_partial = scraper.HTML_PARSER, scraper.PARTIAL_PARSE
+    try:
+        for retailer, (matches, parse) in RETAILERS.items():
+            pages = [res for url, res in recorded.items() if matches(url)]
+            if not pages:
+                continue
+            for parser in parsers:
+                for mode in modes:
+                    scraper.HTML_PARSER = parser
+                    scraper.PARTIAL_PARSE = mode == "partial"
+                    products, seconds, peak_kb = time_parse(parse, pages, repeat)
+                    results.append({
+                        "retailer": retailer,
+                        "parser": parser,
+                        "mode": mode,
+                        "pages": len(pages),
+                        "products": products,
+                        "seconds": round(seconds, 4),
+                        "products_per_second": round(products / seconds, 1) if seconds else 0.0,
+                        "peak_kb": round(peak_kb),
+                    })
+    finally:
+        scraper.HTML_PARSER, scraper.PARTIAL_PARSE = original_parser, original_partial
+    return results
+
+
+def print_results(results: List[Dict]):
+    print(f"{'retailer':<16} {'parser':<12} {'mode':<8} {'pages':>6} {'products':>9} {'seconds':>9} {'products/s':>11} {'peak KB':>9}")
+    for row in results:
+        print(f"{row['retailer']:<16} {row['parser']:<12} {row['mode']:<8} {row['pages']:>6} {row['products']:>9} {row['seconds']:>9.3f} {row['products_per_second']:>11.1f} {row['peak_kb']:>9}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark HTML parsing on recorded retailer pages")
+    arg_parser.add_argument("cassette", nargs="?", default=str(CASSETTE_PATH), help="cassette zip recorded with SCRAPER_CASSETTE_MODE=record")
+    arg_parser.add_argument("--parsers", default="html.parser,lxml", help="comma-separated BeautifulSoup tree builders")
+    arg_parser.add_argument("--modes", default="partial,full", help="comma-separated: partial (product grid only) and/or full page parsing")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="passes per measurement (best one is kept)")
+    args = arg_parser.parse_args()
+
+    print("⏱️ HTML parser benchmark on", args.cassette)
+    print_results(run_benchmark(args.cassette, args.parsers.split(","), args.modes.split(","), args.repeat))
@@ -0,0 +1,1262 @@
+"""
+Asyncio fetch engine shared by every retailer crawler in scraper.py
+Crawlers stay plain functions: they fetch through a SiteCrawlContext (get/paginate),
+or fetch()/fetch_as_completed() for standalone pages, and the requests run
+concurrently on one background event loop with bounded per-host concurrency.
+Each host gets its own keep-alive connection pool, so pages of the same retailer
+reuse open TCP/TLS connections instead of handshaking for every request
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import atexit
+import json
+import os
+import random
+import threading
+import time
+import zipfile
+from collections import Counter, deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+# Seconds before a single request is abandoned (requests.get had no timeout at all)
+DEFAULT_TIMEOUT = 30
+
+# Max requests in flight against one host at any moment
+DEFAULT_HOST_CONCURRENCY = 4
+
+# Per-host overrides for DEFAULT_HOST_CONCURRENCY, keyed by hostname
+HOST_CONCURRENCY: Dict[str, int] = {}
+
+# Pages paginate() keeps in flight ahead of the one being parsed
+DEFAULT_PAGE_WINDOW = 4
+
+# Connections kept open per host and how long an idle one survives (seconds)
+DEFAULT_POOL_SIZE = 4
+DEFAULT_KEEPALIVE_EXPIRY = 30
+
+# Per-host overrides, e.g. {"kolshzin.com": {"pool_size": 2, "keepalive_expiry": 60}}
+HOST_POOL_SETTINGS: Dict[str, Dict[str, float]] = {}
+
+# API hosts whose concurrent page/category requests share multiplexed HTTP/2 connections
+# (needs the optional h2 package; without it they use HTTP/1.1 pooling like every other host),
+# and the requests in flight allowed against each of them unless HOST_CONCURRENCY says otherwise
+HTTP2_HOSTS = {"www.jokercenter.net", "api.spniq.com"}
+HTTP2_HOST_CONCURRENCY = 8
+
+# Adaptive token bucket per host: requests/second it starts at and the range it may move in
+DEFAULT_RATE = 4.0
+MIN_RATE = 0.5
+MAX_RATE = 20.0
+DEFAULT_BURST = 4
+
+# Per-host overrides, e.g. {"www.almanjam.com": {"rate": 2, "max_rate": 5, "burst": 2}}
+HOST_RATE_SETTINGS: Dict[str, Dict[str, float]] = {}
+
+# Responses that mean "slow down", how long to pause when no Retry-After is sent,
+# and how many times a throttled request is re-sent before giving up
+THROTTLE_STATUSES = (429, 503)
+DEFAULT_THROTTLE_PAUSE = 5.0
+MAX_THROTTLE_RETRIES = 3
+
+# A host counts as struggling once its smoothed latency exceeds this multiple of the best seen,
+# and is at least SLOW_LATENCY_MARGIN seconds above it (so jitter on fast hosts is ignored)
+SLOW_LATENCY_FACTOR = 2.0
+SLOW_LATENCY_MARGIN = 0.25
+
+# Failed requests (connection errors, timeouts, these statuses) are retried with exponential
+# backoff: BACKOFF_BASE * 2^attempt seconds, capped at BACKOFF_MAX, with full jitter
+RETRY_STATUSES = (500, 502, 504)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# A host's circuit opens after this many consecutive failed requests (each counted once,
+# after its retries); while open every request to it fails fast, and after BREAKER_COOLDOWN seconds one trial request is let through
+BREAKER_FAILURE_THRESHOLD = 6
+BREAKER_COOLDOWN = 60.0
+
+# Threads in the crawl scheduler shared by every retailer: site crawls and their
+# category crawls are all tasks on this one pool. The threads mostly wait on the
+# engine, whose per-host limits still bound the actual traffic
+CRAWL_WORKERS = 16
+
+# Seconds one retailer crawl may run before its remaining requests are cut short and it
+# returns what it has (marked partial); per-site overrides keyed by site name
+DEFAULT_SITE_TIME_BUDGET = 600.0
+SITE_TIME_BUDGETS: Dict[str, float] = {}
+
+# Where ETag / Last-Modified validators and page bodies are kept between runs (None disables it)
+CONDITIONAL_CACHE_DIR: Optional[Path] = Path(__file__).parent / ".http_cache"
+
+# Seconds a cached page survives without being stored or revalidated; older entries
+# (pages past the end, URLs whose ordering shifted) are deleted when the cache opens
+CONDITIONAL_CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Record/replay archive: "record" saves every response the crawlers receive into CASSETTE_PATH,
+# "replay" answers every request from it without touching the network; unset means live crawling
+CASSETTE_MODE: Optional[str] = os.environ.get("SCRAPER_CASSETTE_MODE", "").strip().lower() or None
+CASSETTE_PATH = Path(os.environ.get("SCRAPER_CASSETTE_PATH", Path(__file__).parent / ".cassettes" / "crawl.zip"))
+
+
+def supported_encodings() -> str:
+    """Accept-Encoding value listing every content coding httpx can decode in this environment
+
+    zstd and br need the optional zstandard and brotli (or brotlicffi) packages;
+    without them only gzip/deflate are advertised, so servers never send a body
+    we cannot decode. httpx decodes whichever coding comes back incrementally,
+    chunk by chunk as it is read off the socket.
+    """
+    encodings = []
+    try:
+        import zstandard  # noqa: F401
+        encodings.append("zstd")
+    except ImportError:
+        pass
+    try:
+        import brotli  # noqa: F401
+        encodings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append("br")
+        except ImportError:
+            pass
+    return ", ".join(encodings + ["gzip", "deflate"])
+
+
+ACCEPT_ENCODING = supported_encodings()
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_host(url: str) -> str:
+    """Return the lowercase hostname of a URL"""
+    return (urlsplit(url).hostname or "").lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostRateLimiter:
+    """Adaptive token bucket for one host
+
+    The refill rate grows additively while the host answers quickly and is cut
+    when latency climbs or the host answers 429/503 (multiplicative decrease).
+    A Retry-After header pauses the whole host until it has passed.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST, min_rate: float = MIN_RATE, max_rate: float = MAX_RATE):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.best_latency = None
+        self.avg_latency = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until the host may receive another request"""
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def record(self, status_code: int, latency: float, retry_after: Optional[float] = None):
+        """Adjust the rate from the outcome of one request"""
+        if status_code in THROTTLE_STATUSES:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+            pause = retry_after if retry_after is not None else DEFAULT_THROTTLE_PAUSE
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            return
+
+        self.best_latency = latency if self.best_latency is None else min(self.best_latency, latency)
+        self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+        slow_above = max(self.best_latency * SLOW_LATENCY_FACTOR, self.best_latency + SLOW_LATENCY_MARGIN)
+        if self.avg_latency > slow_above:
+            self.rate = max(self.min_rate, self.rate * 0.75)
+        else:
+            self.rate = min(self.max_rate, self.rate + 0.5)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Seconds to wait before retry number attempt+1 (exponential with full jitter)"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def deadline_response(url: str) -> httpx.Response:
+    """Stand-in answer for a request cut off by its deadline
+
+    Crawlers treat it like any failed page (non-200, empty body), so they stop
+    on their own instead of having to catch an exception.
+    """
+    return httpx.Response(504, request=httpx.Request("GET", url), extensions={"deadline_exceeded": True})
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request to a host whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host
+
+    closed: requests flow normally. open: requests fail at once with
+    CircuitOpenError. half-open (cooldown passed): one trial request is let
+    through and the rest fail fast until it is done; a success closes the
+    circuit, a failure opens it for another cooldown.
+    """
+
+    def __init__(self, threshold: int = BREAKER_FAILURE_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self.rejected = 0
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def check(self, host: str) -> bool:
+        """Raise CircuitOpenError unless a request may go out; True when it is the half-open trial"""
+        state = self.state
+        if state == "open" or (state == "half-open" and self.trial_in_flight):
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuit open for {host} after {self.failures} consecutive failures")
+        if state == "half-open":
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self):
+        """The trial request ended without an outcome (cancelled); let the next one try"""
+        self.trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        state = self.state
+        if state == "half-open" or (state == "closed" and self.failures >= self.threshold):
+            self.trips += 1
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "trips": self.trips, "rejected": self.rejected}
+
+
+class ConditionalCache:
+    """On-disk validator cache so unchanged catalog pages come back as 304s
+
+    Every 200 response carrying an ETag or Last-Modified header is stored as a
+    <sha1>.json metadata file plus a <sha1>.body file holding the decoded body.
+    The next request for that URL sends If-None-Match / If-Modified-Since, and a
+    304 answer is turned back into a 200 response built from the stored body.
+
+    An entry's metadata file is touched whenever it is stored or revalidated;
+    entries untouched for max_age seconds are pruned when the cache is opened.
+    """
+
+    def __init__(self, directory: Path, max_age: float = CONDITIONAL_CACHE_MAX_AGE):
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.hits = 0
+        self.stores = 0
+        self.pruned = self.prune()
+
+    def prune(self) -> int:
+        """Delete entries not used for max_age seconds (and bodies left without metadata); returns how many"""
+        if not self.directory.is_dir():
+            return 0
+        cutoff = time.time() - self.max_age
+        pruned = 0
+        for path in self.directory.iterdir():
+            try:
+                if path.suffix == ".json" and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    path.with_suffix(".body").unlink(missing_ok=True)
+                    pruned += 1
+                elif path.suffix == ".body" and not path.with_suffix(".json").exists():
+                    path.unlink()
+            except OSError:
+                continue
+        return pruned
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def lookup(self, url: str) -> Optional[Dict[str, str]]:
+        """Stored validators for a URL, or None when nothing usable is cached"""
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def conditional_headers(self, entry: Dict[str, str]) -> Dict[str, str]:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, response: httpx.Response):
+        """Remember the body and validators of a 200 response"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        meta_path, body_path = self._paths(url)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            body_path.write_bytes(response.content)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "url": url,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "content_type": response.headers.get("Content-Type", ""),
+                }, f)
+            self.stores += 1
+        except OSError as e:
+            print(f"⚠️ Could not cache {url}: {e}")
+
+    def replay(self, url: str, entry: Dict[str, str], request: httpx.Request) -> Optional[httpx.Response]:
+        """Rebuild the stored 200 response after the server answered 304"""
+        _, body_path = self._paths(url)
+        try:
+            body = body_path.read_bytes()
+        except OSError:
+            return None
+        self.hits += 1
+        try:
+            os.utime(self._paths(url)[0])
+        except OSError:
+            pass
+        headers = {"Content-Type": entry.get("content_type", "")}
+        return httpx.Response(200, headers=headers, content=body, request=request, extensions={"from_cache": True})
+
+
+class Cassette:
+    """Compressed on-disk archive of responses for offline, repeatable crawls
+
+    The archive is a deflate-compressed zip holding, per URL, a <sha1>.json
+    metadata entry and a <sha1>.body entry with the decoded body. In record
+    mode every response is appended as it arrives (a URL is only stored once
+    per archive); in replay mode responses are rebuilt from the archive and a
+    URL that was never recorded comes back as a 404 so crawlers simply stop.
+    """
+
+    def __init__(self, path: Path, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode {mode!r} (expected 'record' or 'replay')")
+        self.path = Path(path)
+        self.mode = mode
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._zip = None
+        self._names = set()
+        self._fresh = True
+        self._lock = threading.Lock()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _open(self) -> zipfile.ZipFile:
+        if self._zip is None:
+            if self.replaying:
+                self._zip = zipfile.ZipFile(self.path, "r")
+            else:
+                # A recording run starts a new archive; reopening after close() appends to it
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._zip = zipfile.ZipFile(self.path, "w" if self._fresh else "a", compression=zipfile.ZIP_DEFLATED)
+                self._fresh = False
+            self._names = set(self._zip.namelist())
+        return self._zip
+
+    def record(self, url: str, status_code: int, content_type: str, body: bytes):
+        key = self._key(url)
+        try:
+            with self._lock:
+                archive = self._open()
+                if f"{key}.json" in self._names:
+                    return
+                archive.writestr(f"{key}.body", body)
+                archive.writestr(f"{key}.json", json.dumps({
+                    "url": url,
+                    "status_code": status_code,
+                    "content_type": content_type,
+                }))
+                self._names.update((f"{key}.body", f"{key}.json"))
+                self.recorded += 1
+        except OSError as e:
+            print(f"⚠️ Could not record {url}: {e}")
+
+    def record_response(self, url: str, response) -> None:
+        """Record an httpx or requests response"""
+        self.record(url, response.status_code, response.headers.get("Content-Type", ""), response.content)
+
+    def replay(self, url: str) -> httpx.Response:
+        key = self._key(url)
+        request = httpx.Request("GET", url)
+        with self._lock:
+            archive = self._open()
+            if f"{key}.json" not in self._names:
+                self.misses += 1
+                return httpx.Response(404, request=request, extensions={"cassette_miss": True})
+            entry = json.loads(archive.read(f"{key}.json"))
+            body = archive.read(f"{key}.body")
+            self.replayed += 1
+        headers = {"Content-Type": entry.get("content_type", "")}
+        return httpx.Response(entry["status_code"], headers=headers, content=body, request=request, extensions={"from_cassette": True})
+
+    def close(self):
+        """Finish the zip's central directory so the archive is readable"""
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+                if self.mode == "record":
+                    print(f"📼 Recorded {self.recorded} responses to {self.path}")
+                else:
+                    print(f"📼 Replayed {self.replayed} responses from {self.path} ({self.misses} not recorded)")
+
+
+def normalize_url(url: str) -> str:
+    """url in one canonical spelling: lowercase scheme and host, no default port or fragment, sorted query"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+    if parts.port is not None and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        netloc += f":{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+class RequestMemo:
+    """Coalesces duplicate in-flight GETs during one scrape run, keyed by normalized URL (plus any per-request headers)
+
+    A request for a URL that is already in flight waits for that fetch instead
+    of sending its own. Only in-flight fetches are shared: once one finishes it
+    is forgotten, so the run never holds the pages it downloaded, and a later
+    repeat goes out again (a cheap 304 when the conditional cache has the page).
+    Used only on the engine's event loop, so it needs no lock.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
+        self.saved = 0
+
+    def _settle(self, key: tuple, entry: asyncio.Future):
+        if self._in_flight.get(key) is entry:
+            del self._in_flight[key]
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]], fetch: Callable[[], Any]) -> httpx.Response:
+        key = (normalize_url(url), tuple(sorted(headers.items())) if headers else ())
+        entry = self._in_flight.get(key)
+        if entry is not None:
+            self.saved += 1
+        else:
+            entry = asyncio.ensure_future(fetch())
+            entry.add_done_callback(lambda done: self._settle(key, done))
+            self._in_flight[key] = entry
+        # Shielded, so a caller cut off by its deadline leaves the fetch running for the others
+        return await asyncio.shield(entry)
+
+
+class FetchEngine:
+    """Runs HTTP requests on a dedicated asyncio loop in a background thread"""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT):
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self._loop = None
+        self._thread = None
+        self._clients = {}
+        self._host_semaphores = {}
+        self._rate_limiters = {}
+        self._breakers = {}
+        self._warmed = set()
+        self._lock = threading.Lock()
+        self.http2 = http2_available()
+        self.cache = ConditionalCache(CONDITIONAL_CACHE_DIR) if CONDITIONAL_CACHE_DIR else None
+        self.cassette = Cassette(CASSETTE_PATH, CASSETTE_MODE) if CASSETTE_MODE else None
+        if self.cassette:
+            atexit.register(self.cassette.close)
+        self.memo: Optional[RequestMemo] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="fetch-engine", daemon=True)
+                self._thread.start()
+        return self._loop
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the engine loop without waiting for it"""
+        return asyncio.run_coroutine_threadsafe(self._settled(coro), self._ensure_loop())
+
+    @staticmethod
+    async def _settled(coro):
+        # A caller that cancels its future (paginate past the last page) never reads
+        # the task's outcome, and a cancel racing a failure still ends the task with
+        # that error; reading it here keeps asyncio from logging "never retrieved"
+        asyncio.current_task().add_done_callback(lambda task: task.cancelled() or task.exception())
+        return await coro
+
+    def run(self, coro):
+        """Run a coroutine on the engine loop and block until it finishes"""
+        return self.submit(coro).result()
+
+    # Everything below only ever runs on the engine loop thread
+
+    def _get_client(self, host: str) -> httpx.AsyncClient:
+        """Return the pooled keep-alive client for a host, creating it on first use"""
+        client = self._clients.get(host)
+        if client is None:
+            settings = HOST_POOL_SETTINGS.get(host, {})
+            pool_size = int(settings.get("pool_size", DEFAULT_POOL_SIZE))
+            limits = httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=settings.get("keepalive_expiry", DEFAULT_KEEPALIVE_EXPIRY),
+            )
+            # On HTTP/2 hosts concurrent requests become streams on an open connection;
+            # the pool size only matters if the server turns out to speak HTTP/1.1 only
+            client = httpx.AsyncClient(headers=self.headers, follow_redirects=True, timeout=self.timeout, limits=limits,
+                                       http2=self.uses_http2(host))
+            self._clients[host] = client
+        return client
+
+    def uses_http2(self, host: str) -> bool:
+        return self.http2 and host in HTTP2_HOSTS
+
+    def host_concurrency(self, host: str) -> int:
+        """Requests allowed in flight against host at once"""
+        default = HTTP2_HOST_CONCURRENCY if self.uses_http2(host) else DEFAULT_HOST_CONCURRENCY
+        return HOST_CONCURRENCY.get(host, default)
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.host_concurrency(host))
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    def rate_limiter(self, host: str) -> HostRateLimiter:
+        limiter = self._rate_limiters.get(host)
+        if limiter is None:
+            limiter = HostRateLimiter(**HOST_RATE_SETTINGS.get(host, {}))
+            self._rate_limiters[host] = limiter
+        return limiter
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker()
+            self._breakers[host] = breaker
+        return breaker
+
+    def breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of every host's circuit breaker, keyed by hostname"""
+        return {host: breaker.snapshot() for host, breaker in list(self._breakers.items())}
+
+    async def _send(self, host: str, url: str, headers: Optional[Dict[str, str]], timeout: Optional[float]) -> httpx.Response:
+        """One attempt: wait for a host slot and rate-limit token, re-sending throttled responses
+
+        429/503 responses are re-sent after the host's Retry-After pause, up to
+        MAX_THROTTLE_RETRIES times; the last response is returned either way.
+        """
+        limiter = self.rate_limiter(host)
+        async with self._host_semaphore(host):
+            for attempt in range(MAX_THROTTLE_RETRIES + 1):
+                await limiter.acquire()
+                started = time.monotonic()
+                response = await self._get_client(host).get(url, headers=headers, timeout=timeout or self.timeout)
+                limiter.record(response.status_code, time.monotonic() - started, parse_retry_after(response.headers.get("Retry-After")))
+                if response.status_code not in THROTTLE_STATUSES:
+                    break
+        return response
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> httpx.Response:
+        """GET a URL, giving up once `deadline` (a time.monotonic() value) has passed
+
+        Waiting for a host slot, rate-limit tokens and backoff all count against
+        the deadline; when it runs out the request is cancelled and a
+        deadline_response() is returned instead. While a run's RequestMemo is
+        active, repeats of a URL are served by it.
+        """
+        if self.memo is not None:
+            request = self.memo.get(url, headers, lambda: self._get(url, headers, timeout))
+        else:
+            request = self._get(url, headers, timeout)
+        if deadline is None:
+            return await request
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            request.close()
+            return deadline_response(url)
+        try:
+            return await asyncio.wait_for(request, remaining)
+        except asyncio.TimeoutError:
+            return deadline_response(url)
+
+    async def _get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> httpx.Response:
+        """GET a URL once its host has a free slot and a rate-limit token
+
+        Connection errors, timeouts and RETRY_STATUSES answers are retried up to
+        MAX_RETRIES times with jittered exponential backoff (the host slot is
+        released while waiting). The request's outcome after its retries feeds the
+        host's circuit breaker (a half-open trial gets a single attempt); once it is
+        open the request raises CircuitOpenError without being sent.
+        """
+        if self.cassette and self.cassette.replaying:
+            return await asyncio.to_thread(self.cassette.replay, url)
+        host = get_host(url)
+        breaker = self.breaker(host)
+        cached = await asyncio.to_thread(self.cache.lookup, url) if self.cache else None
+        if cached:
+            headers = {**(headers or {}), **self.cache.conditional_headers(cached)}
+        for attempt in range(MAX_RETRIES + 1):
+            trial = breaker.check(host)
+            last_attempt = trial or attempt == MAX_RETRIES
+            try:
+                response = await self._send(host, url, headers, timeout)
+            except httpx.TransportError:
+                if last_attempt:
+                    breaker.record_failure()
+                    raise
+            except BaseException:
+                if trial:
+                    breaker.release_trial()
+                raise
+            else:
+                if response.status_code < 500:
+                    breaker.record_success()
+                    break
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    breaker.record_failure()
+                    break
+            await asyncio.sleep(backoff_delay(attempt))
+        if self.cache:
+            if response.status_code == 304 and cached:
+                response = await asyncio.to_thread(self.cache.replay, url, cached, response.request) or response
+            else:
+                await asyncio.to_thread(self.cache.store, url, response)
+        if self.cassette:
+            await asyncio.to_thread(self.cassette.record_response, url, response)
+        return response
+
+    async def probe(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> httpx.Response:
+        """One GET attempt that bypasses retries, the conditional cache and the circuit breaker
+
+        For requests expected to fail, such as trying which page sizes an API
+        accepts: an answer of 5xx or a connection error means "no" and must
+        not count as the host failing. Host slot, rate limit, cassette and
+        deadline still apply, as in get().
+        """
+        if self.cassette and self.cassette.replaying:
+            return await asyncio.to_thread(self.cassette.replay, url)
+        if deadline is None:
+            response = await self._send(get_host(url), url, headers, timeout)
+        else:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return deadline_response(url)
+            try:
+                response = await asyncio.wait_for(self._send(get_host(url), url, headers, timeout), remaining)
+            except asyncio.TimeoutError:
+                return deadline_response(url)
+        if self.cassette:
+            await asyncio.to_thread(self.cassette.record_response, url, response)
+        return response
+
+    def is_warm(self, host: str) -> bool:
+        return host in self._warmed
+
+    async def warm_up(self, urls: List[str], timeout: float = 10.0) -> int:
+        """Resolve every URL's host, then open its pooled connection and collect its cookies
+
+        All hosts are warmed concurrently; hosts already warm are skipped. A host
+        that fails to resolve is not visited. The visit is a single probe()
+        attempt, and the whole warm-up is bounded to twice the timeout (resolve,
+        then visit), so a dead homepage cannot hold up the crawl; hosts not warm
+        by then warm up on first use. Returns how many hosts are warm.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def warm(url: str) -> bool:
+            host = get_host(url)
+            if host in self._warmed:
+                return True
+            if not (self.cassette and self.cassette.replaying):
+                parts = urlsplit(url)
+                port = parts.port or (443 if parts.scheme == "https" else 80)
+                try:
+                    await asyncio.wait_for(loop.getaddrinfo(host, port), timeout)
+                except (OSError, asyncio.TimeoutError) as e:
+                    print(f"⚠️ Could not resolve {host}: {e}")
+                    return False
+            try:
+                await self.probe(url, timeout=timeout)
+            except httpx.HTTPError as e:
+                print(f"⚠️ Failed to visit homepage {url}: {e}")
+                return False
+            self._warmed.add(host)
+            return True
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*(warm(url) for url in urls)), 2 * timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Warm-up stopped after {2 * timeout:.0f}s, the remaining hosts warm up on first use")
+        return sum(get_host(url) in self._warmed for url in urls)
+
+
+_engine: Optional[FetchEngine] = None
+_engine_lock = threading.Lock()
+
+
+def configure(headers: Dict[str, str], timeout: float = DEFAULT_TIMEOUT) -> FetchEngine:
+    """Create the shared engine with the default headers every request should send"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = FetchEngine(headers=headers, timeout=timeout)
+    return _engine
+
+
+def get_engine() -> FetchEngine:
+    if _engine is None:
+        return configure({})
+    return _engine
+
+
+def fetch(url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> httpx.Response:
+    """Blocking GET through the shared engine (drop-in for requests.get)"""
+    engine = get_engine()
+    return engine.run(engine.get(url, headers=headers, timeout=timeout, deadline=deadline))
+
+
+def fetch_external(url: str, send: Callable[[], Any]):
+    """Route a request made outside the engine (e.g. a cloudscraper session) through
+    the cassette and the host's circuit breaker
+
+    send() performs the real request; it is skipped entirely when replaying, and
+    raises CircuitOpenError without being called while the host's circuit is open.
+    """
+    engine = get_engine()
+    cassette = engine.cassette
+    if cassette and cassette.replaying:
+        return cassette.replay(url)
+    host = get_host(url)
+    breaker = engine.breaker(host)
+    breaker.check(host)
+    try:
+        response = send()
+    except Exception:
+        breaker.record_failure()
+        raise
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    if cassette:
+        cassette.record_response(url, response)
+    return response
+
+
+def begin_request_memo() -> RequestMemo:
+    """Share in-flight duplicate GETs until end_request_memo() (one scrape run)"""
+    engine = get_engine()
+    engine.memo = RequestMemo()
+    return engine.memo
+
+
+def end_request_memo(memo: RequestMemo) -> int:
+    """Drop the run's memo (unless a newer run replaced it) and return how many fetches it shared"""
+    engine = get_engine()
+    if engine.memo is memo:
+        engine.memo = None
+    return memo.saved
+
+
+def get_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Circuit breaker state of every host contacted so far (for main.py's status and run summary)"""
+    return get_engine().breaker_states()
+
+
+def close_cassette():
+    """Flush the record/replay archive at the end of a crawl (no-op when cassettes are off)"""
+    cassette = get_engine().cassette
+    if cassette:
+        cassette.close()
+
+
+def warm_up(urls: List[str], timeout: float = 10.0) -> int:
+    """Blocking concurrent warm-up of several sites (DNS, pooled connection, cookies)"""
+    engine = get_engine()
+    started = time.monotonic()
+    warm = engine.run(engine.warm_up(urls, timeout=timeout))
+    print(f"🔥 Warmed up {warm}/{len(urls)} hosts in {time.monotonic() - started:.1f}s")
+    return warm
+
+
+def fetch_as_completed(urls: List[str], headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> Iterator[Tuple[str, Optional[httpx.Response]]]:
+    """Fetch several URLs concurrently, yielding (url, response) as each one arrives
+
+    Lets the caller parse early pages while later ones are still in flight;
+    a failed request yields None as its response.
+    """
+    engine = get_engine()
+    futures = {engine.submit(engine.get(url, headers=headers, timeout=timeout, deadline=deadline)): url for url in urls}
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            url = futures[future]
+            try:
+                yield url, future.result()
+            except httpx.HTTPError as e:
+                print(f"⚠️ Fetch failed for {url}: {e}")
+                yield url, None
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def paginate(page_url: Callable[[int], str], extract: Callable[[httpx.Response], list], window: int = DEFAULT_PAGE_WINDOW, start: int = 1, page_size: Optional[int] = None, on_error: Optional[Callable[[str, Exception], None]] = None, **kwargs) -> Iterator[list]:
+    """Yield extract(response) for page start, start+1, ... in order
+
+    Up to `window` pages are requested ahead of the one being parsed. The walk
+    stops at the first page whose extract() result is empty, or whose request
+    failed for good (retries exhausted or the host's circuit is open), in which
+    case on_error(url, error) is called; any pages already requested past that
+    point are cancelled and their responses discarded.
+
+    When the endpoint's page_size is known, a page with fewer items is treated
+    as the last one, and only the first page is requested on its own - the
+    window opens once a full page shows the collection goes on.
+    """
+    engine = get_engine()
+    in_flight = deque()
+    next_page = start
+    ahead = 1 if page_size else max(window, 1)
+    try:
+        while True:
+            while len(in_flight) < ahead:
+                url = page_url(next_page)
+                in_flight.append((url, engine.submit(engine.get(url, **kwargs))))
+                next_page += 1
+            url, future = in_flight.popleft()
+            try:
+                response = future.result()
+            except httpx.TransportError as e:
+                print(f"⚠️ Stopping pagination at {url}: {e}")
+                if on_error:
+                    on_error(url, e)
+                return
+            items = extract(response)
+            if not items:
+                return
+            yield items
+            if page_size:
+                if len(items) < page_size:
+                    return
+                ahead = max(window, 1)
+    finally:
+        for _, future in in_flight:
+            future.cancel()
+
+
+class FetchSession:
+    """requests.Session-style facade so existing crawler code can keep calling session.get()"""
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> httpx.Response:
+        return fetch(url, headers=headers, timeout=timeout, deadline=deadline)
+
+    def paginate(self, page_url: Callable[[int], str], extract: Callable[[httpx.Response], list], **kwargs) -> Iterator[list]:
+        return paginate(page_url, extract, **kwargs)
+
+
+# -------------------- Crawl Scheduler --------------------
+class CrawlTask:
+    """One unit of crawl work (a whole site, or one category of it) queued on the CrawlScheduler
+
+    Tasks remember the task that submitted them, so a finished run can be walked
+    from the site crawls down to the category that held each one up.
+    """
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, label: str, host: Optional[str], parent: Optional["CrawlTask"]):
+        self.fn = fn
+        self.args = args
+        self.label = label
+        self.host = host
+        self.parent = parent
+        self.children: List["CrawlTask"] = []
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self._done = threading.Event()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def seconds(self) -> float:
+        """Time spent running (0 until it has started)"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def result(self):
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class CrawlScheduler:
+    """Process-wide work-stealing pool every retailer crawl runs its tasks on
+
+    Site crawls and the category crawls they fan out to share one queue and
+    CRAWL_WORKERS threads, so workers a fast site no longer needs go straight to
+    a slow site's remaining categories. A worker never takes a task for a host
+    that already has engine.host_concurrency() tasks running, since it would
+    only sit on the host's semaphore. A thread waiting in gather() does not
+    block either: it runs queued tasks itself (its own first) until the ones it
+    waits for are done, so nested fan-out cannot starve the pool.
+    """
+
+    def __init__(self, workers: int = CRAWL_WORKERS):
+        self.workers = workers
+        self._queue: deque = deque()
+        self._running = Counter()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._local = threading.local()
+
+    def submit(self, fn: Callable[..., Any], *args, label: Optional[str] = None, host: Optional[str] = None) -> CrawlTask:
+        """Queue fn(*args); host (if any) is the host whose task limit it counts against"""
+        parent = getattr(self._local, "task", None)
+        task = CrawlTask(fn, args, label or getattr(fn, "__name__", "task"), host, parent)
+        with self._cond:
+            if parent is not None:
+                parent.children.append(task)
+            self._queue.append(task)
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"crawl-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify_all()
+        return task
+
+    def _host_has_room(self, host: Optional[str]) -> bool:
+        return host is None or self._running[host] < get_engine().host_concurrency(host)
+
+    def _take(self, prefer: Optional[set] = None) -> Optional[CrawlTask]:
+        """Pop the oldest queued task whose host has room (from prefer first); call with _cond held"""
+        for only_preferred in ((True, False) if prefer else (False,)):
+            for task in self._queue:
+                if only_preferred and id(task) not in prefer:
+                    continue
+                if self._host_has_room(task.host):
+                    self._queue.remove(task)
+                    if task.host is not None:
+                        self._running[task.host] += 1
+                    return task
+        return None
+
+    def _run(self, task: CrawlTask):
+        previous = getattr(self._local, "task", None)
+        self._local.task = task
+        task.started = time.monotonic()
+        try:
+            task.value = task.fn(*task.args)
+        except BaseException as e:
+            task.error = e
+        finally:
+            task.finished = time.monotonic()
+            self._local.task = previous
+            with self._cond:
+                if task.host is not None:
+                    self._running[task.host] -= 1
+                task._done.set()
+                self._cond.notify_all()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                task = self._take()
+                while task is None:
+                    self._cond.wait()
+                    task = self._take()
+            self._run(task)
+
+    def gather(self, tasks: List[CrawlTask]) -> List[CrawlTask]:
+        """Wait until every task is done, running queued tasks on this thread meanwhile"""
+        prefer = {id(task) for task in tasks}
+        while True:
+            with self._cond:
+                if all(task.done() for task in tasks):
+                    return tasks
+                task = self._take(prefer)
+                if task is None:
+                    self._cond.wait(timeout=0.5)
+                    continue
+            self._run(task)
+
+    @staticmethod
+    def critical_path(tasks: List[CrawlTask]) -> List[CrawlTask]:
+        """The chain of tasks the run waited on: the last to finish, then its last-finishing child, and so on"""
+        path = []
+        candidates = [task for task in tasks if task.finished is not None]
+        while candidates:
+            last = max(candidates, key=lambda task: task.finished)
+            path.append(last)
+            candidates = [task for task in last.children if task.finished is not None]
+        return path
+
+
+_scheduler: Optional[CrawlScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> CrawlScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = CrawlScheduler()
+        return _scheduler
+
+
+def format_critical_path(path: List[CrawlTask]) -> str:
+    """One line per run, e.g. 'altajit 41.2s → altajit gpu 18.3s (queued 2.1s)'"""
+    steps = []
+    for task in path:
+        step = f"{task.label} {task.seconds:.1f}s"
+        waited = (task.started or task.submitted) - task.submitted
+        if waited >= 0.1:
+            step += f" (queued {waited:.1f}s)"
+        steps.append(step)
+    return " → ".join(steps)
+
+
+# Summary of the latest finished crawl per site name, handed to main.py by take_crawl_report()
+_crawl_reports: Dict[str, Dict[str, Any]] = {}
+
+
+def take_crawl_report(site_name: str) -> Optional[Dict[str, Any]]:
+    """Pop the report the last crawl of site_name left behind (None if it never reported)"""
+    return _crawl_reports.pop(site_name, None)
+
+
+class SiteCrawlContext(FetchSession):
+    """Everything one retailer crawl shares: its session, host rate limiter, stats and dedupe index
+
+    Category crawlers register products with add(). The index of product keys
+    (IDs, links) grows incrementally, so each dedupe check is one set lookup
+    instead of rebuilding sets of everything crawled so far.
+
+    The crawl also gets a time budget (SITE_TIME_BUDGETS, else
+    DEFAULT_SITE_TIME_BUDGET) starting now. Every request made through the
+    context carries its deadline; once it has passed, requests come back as
+    deadline_response()s, crawlers stop paging, and the crawl is marked partial.
+    A walk or request given up on after retries (transport errors, an open
+    circuit, a 5xx/429 page) and a category crawl that raises mark it partial too,
+    so main.py keeps the stored products the crawl did not reach.
+    """
+
+    def __init__(self, site_name: str, base_url: str, time_budget: Optional[float] = None):
+        self.site_name = site_name
+        self.base_url = base_url
+        self.host = get_host(base_url)
+        self.products = []
+        self.index = set()
+        self.stats = Counter()
+        self.started = time.monotonic()
+        self.time_budget = time_budget or SITE_TIME_BUDGETS.get(site_name, DEFAULT_SITE_TIME_BUDGET)
+        self.deadline = self.started + self.time_budget
+        self.partial = False
+        self._lock = threading.Lock()
+
+    @property
+    def limiter(self) -> HostRateLimiter:
+        return get_engine().rate_limiter(self.host)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    def mark_partial(self, message: str):
+        """Flag the crawl as incomplete, printing message the first time"""
+        with self._lock:
+            if self.partial:
+                return
+            self.partial = True
+        print(message)
+
+    def _check_deadline(self, response: httpx.Response) -> httpx.Response:
+        # Compressed bytes read off the wire vs. the decoded body handed to the parser
+        with self._lock:
+            self.stats["wire_bytes"] += response.num_bytes_downloaded
+            self.stats["body_bytes"] += len(response.content)
+        if response.extensions.get("deadline_exceeded"):
+            self.mark_partial(f"⏱️ {self.site_name}: {self.time_budget:.0f}s time budget used up, returning partial results")
+        return response
+
+    def _walk_failed(self, url: str, error: Exception):
+        self.mark_partial(f"⚠️ {self.site_name}: gave up on {url} ({error}), returning partial results")
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> httpx.Response:
+        with self._lock:
+            self.stats["requests"] += 1
+        try:
+            response = super().get(url, headers=headers, timeout=timeout, deadline=deadline or self.deadline)
+        except httpx.TransportError as e:
+            self._walk_failed(url, e)
+            raise
+        return self._check_deadline(response)
+
+    def probe(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> httpx.Response:
+        """FetchEngine.probe() through the context; failures neither trip the breaker nor mark the crawl partial"""
+        with self._lock:
+            self.stats["requests"] += 1
+        engine = get_engine()
+        return self._check_deadline(engine.run(engine.probe(url, headers=headers, timeout=timeout, deadline=self.deadline)))
+
+    def paginate(self, page_url: Callable[[int], str], extract: Callable[[httpx.Response], list], **kwargs) -> Iterator[list]:
+        def counted_extract(response):
+            with self._lock:
+                self.stats["pages"] += 1
+            # A page still failing after the engine's retries ends the walk early, not at the real last page
+            if response.status_code >= 500 or response.status_code == 429:
+                if not response.extensions.get("deadline_exceeded"):
+                    self._walk_failed(str(response.request.url), f"HTTP {response.status_code}")
+            return extract(self._check_deadline(response))
+        kwargs.setdefault("deadline", self.deadline)
+        kwargs.setdefault("on_error", self._walk_failed)
+        return paginate(page_url, counted_extract, **kwargs)
+
+    def warm_up(self):
+        """Visit the homepage once so the host's pooled client holds the site's cookies
+
+        Skipped when a warm-up phase (fetcher.warm_up) already covered the host.
+        """
+        engine = get_engine()
+        if not engine.is_warm(self.host):
+            engine.run(engine.warm_up([self.base_url]))
+
+    def run_concurrently(self, crawl: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """Run crawl(item) for every item as tasks on the shared CrawlScheduler, e.g. one per category
+
+        Returns the results in item order; a crawl that raises is reported and
+        gives None, the others carry on.
+        """
+        items = list(items)
+        scheduler = get_scheduler()
+        tasks = [scheduler.submit(crawl, item, label=f"{self.site_name} {str(item)[:60]}", host=self.host) for item in items]
+        results = []
+        for item, task in zip(items, scheduler.gather(tasks)):
+            try:
+                results.append(task.result())
+            except Exception as e:
+                print(f"⚠️ {self.site_name}: crawl of {item!r} failed: {e}")
+                self.mark_partial(f"⚠️ {self.site_name}: a category crawl failed, returning partial results")
+                results.append(None)
+        return results
+
+    def seen(self, key) -> bool:
+        return key in self.index
+
+    def add(self, product: Dict, *keys) -> bool:
+        """Register a product unless one of its keys (default: its ID) is already indexed
+
+        Empty keys are ignored, so a product without any usable key is always kept.
+        Returns True when the product was added.
+        """
+        keys = [key for key in (keys or (product.get("id"),)) if key]
+        with self._lock:
+            if any(key in self.index for key in keys):
+                self.stats["duplicates"] += 1
+                return False
+            self.index.update(keys)
+            self.products.append(product)
+            return True
+
+    def report(self):
+        """Print the crawl summary and leave it for take_crawl_report()"""
+        elapsed = time.monotonic() - self.started
+        print(f"📊 {self.site_name}: {len(self.products)} products, "
+              f"{self.stats['pages']} pages + {self.stats['requests']} requests, "
+              f"{self.stats['duplicates']} duplicates skipped in {elapsed:.1f}s, "
+              f"{self.stats['wire_bytes'] / 1e6:.1f} MB transferred ({self.stats['body_bytes'] / 1e6:.1f} MB decoded)"
+              f"{' (partial)' if self.partial else ''}")
+        _crawl_reports[self.site_name] = {
+            "products": len(self.products),
+            "pages": self.stats["pages"],
+            "requests": self.stats["requests"],
+            "duplicates": self.stats["duplicates"],
+            "seconds": round(elapsed, 2),
+            "partial": self.partial,
+        }
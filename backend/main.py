@@ -1,11 +1,11 @@
 import threading
-import concurrent.futures
 from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from typing import List, Dict, Any
-from scraper import scrape_all_products, scrape_site_individually
+from scraper import scrape_all_products, scrape_site_individually, warm_up_sites
+from fetcher import begin_request_memo, close_cassette, end_request_memo, format_critical_path, get_breaker_states, get_scheduler, take_crawl_report
 import time
 import json
 import os
@@ -117,7 +117,8 @@ def get_status():
                     "last_updated": site_data.get("last_updated", "Never")
                 }
                 for site_name, site_data in frontend_data.get("sites", {}).items()
-            }
+            },
+            "circuit_breakers": get_breaker_states()
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -231,14 +232,20 @@ def save_single_spec_endpoint(spec_data: Dict[str, Any]):
         print(f"❌ Failed to save single spec: {e}")
         return {"status": "error", "message": str(e)}
 
-def save_all_products_to_frontend(all_sites_data: Dict[str, List[Dict[str, Any]]], merge: bool = False) -> None:
-    """Save all products data to frontend JSON file with optional merge and compatibility specs preservation"""
+def save_all_products_to_frontend(all_sites_data: Dict[str, List[Dict[str, Any]]], merge: bool = False, partial_sites: List[str] = ()) -> None:
+    """Save all products data to frontend JSON file with optional merge and compatibility specs preservation
+
+    Sites in partial_sites had a partial crawl (time budget or failed pages): in
+    merge mode their existing products that the crawl did not reach are kept.
+    """
     
     if merge:
         # Load existing data and merge
         existing_data = load_frontend_data()
         
         # Manual-only retailers that should be preserved (not auto-scraped)
+        # galaxyiq stays manual until its automatic crawl reliably gets past Cloudflare;
+        # it can still be scraped on its own (POST /scrape/galaxyiq)
         manual_retailers = ["galaxyiq"]  # Add any other manual retailers here
         
         # Preserve manual retailers by adding them to the scrape data
@@ -266,11 +273,19 @@ def save_all_products_to_frontend(all_sites_data: Dict[str, List[Dict[str, Any]]
             if site_name in existing_data.get("sites", {}):
                 existing_products = existing_data["sites"][site_name].get("products", [])
                 products = preserve_compatibility_specs(products, existing_products)
+                
+                # A partial crawl only covers part of the catalog - keep what it did not reach
+                if site_name in partial_sites:
+                    scraped_ids = {product.get("id") for product in products}
+                    kept = [product for product in existing_products if product.get("id") not in scraped_ids]
+                    print(f"⏱️  {site_name} crawl was partial. Keeping {len(kept)} existing products it did not reach.")
+                    products = products + kept
             
             existing_data["sites"][site_name] = {
                 "last_updated": datetime.now().isoformat(),
                 "product_count": len(products),
-                "products": products
+                "products": products,
+                "partial": site_name in partial_sites
             }
         
         # Recalculate total products
@@ -406,15 +421,19 @@ def scrape_single_site(site):
         display_name = display_names.get(site, site)
         
         products = scrape_site_individually(site)
+        partial = (take_crawl_report(site) or {}).get("partial", False)
         
-        print(f"{display_name} Completed - {len(products)} products")
+        if partial:
+            print(f"{display_name} Completed - {len(products)} products (partial - time budget or failed pages)")
+        else:
+            print(f"{display_name} Completed - {len(products)} products")
         print()
         
-        return {site: products}
+        return {site: products}, partial
     except Exception as e:
         display_name = display_names.get(site, site)
         print(f"{display_name} Failed - {e}")
-        return {site: []}
+        return {site: []}, False
 
 def scrape_and_save_single_site(site_name: str):
     """Scrape a single site and merge with existing data"""
@@ -422,14 +441,21 @@ def scrape_and_save_single_site(site_name: str):
     start_time = time.time()
     
     try:
-        products = scrape_site_individually(site_name)
+        warm_up_sites([site_name.lower()])
+        request_memo = begin_request_memo()
+        try:
+            products = scrape_site_individually(site_name)
+        finally:
+            end_request_memo(request_memo)
+        partial = (take_crawl_report(site_name) or {}).get("partial", False)
+        close_cassette()
         
         # Save with merge
         all_sites_data = {site_name: products}
-        save_all_products_to_frontend(all_sites_data, merge=True)
+        save_all_products_to_frontend(all_sites_data, merge=True, partial_sites=[site_name] if partial else [])
         
         duration = round(time.time() - start_time, 2)
-        print(f"✅ {site_name} completed in {duration}s - {len(products)} products")
+        print(f"✅ {site_name} completed in {duration}s - {len(products)} products{' (partial)' if partial else ''}")
         
     except Exception as e:
         print(f"❌ {site_name} failed: {e}")
@@ -437,39 +463,66 @@ def scrape_and_save_single_site(site_name: str):
         all_sites_data = {site_name: []}
         save_all_products_to_frontend(all_sites_data, merge=True)
 
+def report_breaker_states():
+    """Print every host whose circuit breaker tripped or is counting failures"""
+    for host, state in get_breaker_states().items():
+        if state["trips"] or state["failures"]:
+            print(f"⚡ {host}: circuit {state['state']} - {state['trips']} trips, "
+                  f"{state['failures']} consecutive failures, {state['rejected']} requests failed fast")
+
 def scrape_and_save_all_sites():
     """Scrape all sites in parallel with clean output and save to frontend JSON file"""
     start_time = time.time()
     
     sites = ["globaliraq", "alityan", "kolshzin", "3d-iraq", "jokercenter", "almanjam", "spniq", "altajit"]
     all_sites_data = {}
+    partial_sites = []
+    
+    # Every retailer's DNS, first connection and cookies at once, so each crawl's first page starts hot
+    warm_up_sites(sites)
+    
+    # A page asked for again while its first fetch is still in flight shares
+    # that download instead of being fetched twice
+    request_memo = begin_request_memo()
+    
+    # Every site crawl is a task on the shared crawl scheduler, and so is each
+    # category it fans out to, so workers a fast site has finished with pick up a
+    # slow site's remaining categories. The engine still bounds how many requests
+    # hit each host at once. A host whose circuit breaker opens fails its remaining
+    # requests fast, so its tasks end early instead of sitting on timeouts. Each
+    # crawl stops at its time budget (fetcher.SITE_TIME_BUDGETS), so the whole
+    # refresh is bounded by the largest one
+    scheduler = get_scheduler()
+    site_tasks = [scheduler.submit(scrape_single_site, site, label=site) for site in sites]
+    for site, task in zip(sites, scheduler.gather(site_tasks)):
+        try:
+            result, partial = task.result()
+            all_sites_data.update(result)
+            if partial:
+                partial_sites.append(site)
+        except Exception as e:
+            print(f"❌ {site}: Exception occurred - {e}")
+            all_sites_data[site] = []
+    
+    # The chain of site and category crawls that decided how long the run took
+    print(f"🧭 Critical path: {format_critical_path(scheduler.critical_path(site_tasks))}")
+    print(f"♻️ Request memo: {end_request_memo(request_memo)} in-flight duplicate fetches shared")
     
-    # Use ThreadPoolExecutor to scrape sites in parallel with clean output
-    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-        # Submit all scraping tasks
-        future_to_site = {executor.submit(scrape_single_site, site): site for site in sites}
-        
-        # Collect results as they complete
-        for future in concurrent.futures.as_completed(future_to_site):
-            site = future_to_site[future]
-            try:
-                result = future.result()
-                all_sites_data.update(result)
-            except Exception as e:
-                print(f"❌ {site}: Exception occurred - {e}")
-                all_sites_data[site] = []
+    # Flush the record/replay archive before the merge and save stages
+    close_cassette()
     
     # Calculate total time
     end_time = time.time()
     total_duration = round(end_time - start_time, 2)
     
     # Save all data to frontend JSON file (merge mode to preserve manual retailers)
-    save_all_products_to_frontend(all_sites_data, merge=True)
+    save_all_products_to_frontend(all_sites_data, merge=True, partial_sites=partial_sites)
     print(f"✅ Parallel scraping completed in {total_duration}s")
     
     # Show summary
     total_products = sum(len(products) for products in all_sites_data.values())
     print(f"📊 Total: {total_products} products from all retailers")
+    report_breaker_states()
 
 # Periodic scraping function
 def periodic_scrape():
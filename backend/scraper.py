@@ -1,11 +1,14 @@
-﻿import requests
-from typing import List, Dict
+﻿from typing import List, Dict
 import time
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import re
 import hashlib
+import json
+from pathlib import Path
 from price_utils import parse_price, calculate_discount
-import sys
+from fetcher import ACCEPT_ENCODING, configure as configure_fetcher, fetch, fetch_as_completed, fetch_external, get_host, SiteCrawlContext, warm_up
+import os
 
 BASE_URL_GLOBAL = "https://globaliraq.net"
 BASE_URL_ALITYAN = "https://alityan.com"
@@ -15,11 +18,12 @@ BASE_URL_JOKERCENTER = "https://www.jokercenter.net"
 BASE_URL_SPNIQ = "https://api.spniq.com"
 BASE_URL_ALMANJAM = "https://www.almanjam.com"
 BASE_URL_ALTAJIT = "https://store.altajit.com"
+BASE_URL_GALAXYIQ = "https://galaxy-iq.com"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
     "Accept-Language": "en-US,en;q=0.9",
-    "Accept-Encoding": "gzip, deflate", 
+    "Accept-Encoding": ACCEPT_ENCODING,  # zstd/br when their decoders are installed, else gzip/deflate
     "Connection": "keep-alive",
     "Upgrade-Insecure-Requests": "1",
     "Sec-Fetch-Dest": "document",
@@ -28,16 +32,54 @@ HEADERS = {
     "Sec-Fetch-User": "?1"
 }
 
-def get_scraper_session(base_url=None):
-    session = requests.Session()
-    session.headers.update(HEADERS)
-    if base_url:
-        try:
-            # Visit homepage to establish session/cookies
-            session.get(base_url, timeout=10)
-        except Exception as e:
-            print(f"âš ï¸ Failed to visit homepage {base_url}: {e}")
-    return session
+# Every crawler fetch goes through the shared asyncio engine with these default headers
+configure_fetcher(HEADERS)
+
+def get_scraper_session(base_url, site_name=None):
+    """Crawl context for a site, with its homepage visited to establish session/cookies"""
+    context = SiteCrawlContext(site_name or get_host(base_url), base_url)
+    context.warm_up()
+    return context
+
+def get_json_products(res) -> List[Dict]:
+    """Products of one Shopify products.json / JokerCenter API page (empty list ends pagination)"""
+    if res.status_code != 200:
+        return []
+    return res.json().get("products", [])
+
+# -------------------- HTML Parsing --------------------
+def pick_html_parser() -> str:
+    """Fastest BeautifulSoup tree builder installed: lxml (C) when available, else html.parser"""
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+# Tree builder every HTML retailer page is parsed with; SCRAPER_HTML_PARSER names one
+# explicitly (e.g. "html.parser" to compare against the old behaviour)
+HTML_PARSER = os.environ.get("SCRAPER_HTML_PARSER") or pick_html_parser()
+
+# With partial parsing, a page is only built as far as the `only` strainer the crawler
+# passes (its product grid), skipping headers, menus and footers; SCRAPER_PARTIAL_PARSE=0
+# builds every page in full
+PARTIAL_PARSE = os.environ.get("SCRAPER_PARTIAL_PARSE", "1") != "0"
+
+def make_soup(markup, only: SoupStrainer = None) -> BeautifulSoup:
+    """Parse a page with HTML_PARSER, keeping just the subtrees `only` matches when partial parsing is on"""
+    return BeautifulSoup(markup, HTML_PARSER, parse_only=only if PARTIAL_PARSE else None)
+
+def class_strainer(class_name: str, tag: str = None) -> SoupStrainer:
+    """Strainer for elements carrying class_name among their classes
+
+    While parsing, the strainer sees the raw class attribute ("card product-card"),
+    so a plain class_="product-card" would miss multi-class elements.
+    """
+    return SoupStrainer(tag, class_=re.compile(rf"(^|\s){re.escape(class_name)}(\s|$)"))
+
+def compile_selectors(selectors: Dict[str, str]) -> Dict:
+    """CSS selectors compiled once, instead of re-parsed by every select_one() call per product card"""
+    return {name: soupsieve.compile(css) for name, css in selectors.items()}
 
 # -------------------- GlobalIraq Parser --------------------
 def parse_globaliraq_product(item: Dict, is_ram: bool = False, is_cpu: bool = False, is_motherboard: bool = False, is_mouse: bool = False, is_keyboard: bool = False, is_power_supply: bool = False, is_case: bool = False, is_storage: bool = False, is_cooler: bool = False, is_monitor: bool = False, is_headset: bool = False, is_laptop: bool = False) -> Dict:
@@ -248,858 +290,212 @@ def parse_alityan_product(item: Dict, is_gpu: bool = False, is_ram: bool = False
     
     return product_data
 
-# -------------------- GlobalIraq Scraper --------------------
-def get_ram_from_globaliraq() -> List[Dict]:
-    """Fetch RAM directly from GlobalIraq's RAM collection"""
-    ram_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/ram-memory/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_globaliraq_product(item, is_ram=True)
-                if product:
-                    ram_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return ram_products
-
-def get_cpus_from_globaliraq() -> List[Dict]:
-    """Fetch CPUs directly from GlobalIraq's processor collection"""
-    cpu_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/processor/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_globaliraq_product(item, is_cpu=True)
-                if product:
-                    cpu_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return cpu_products
-
-def get_motherboards_from_globaliraq() -> List[Dict]:
-    """Fetch Motherboards directly from GlobalIraq's motherboard collection"""
-    motherboard_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/motherboard/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_globaliraq_product(item, is_motherboard=True)
-                if product:
-                    motherboard_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return motherboard_products
-
-def get_mice_from_globaliraq() -> List[Dict]:
-    """Fetch Mice directly from GlobalIraq's mouse collection"""
-    mouse_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/mice/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_globaliraq_product(item, is_mouse=True)
-                if product:
-                    mouse_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return mouse_products
+# -------------------- Category Membership Cache --------------------
+# Category membership maps (product key -> parser category flag) kept between runs,
+# and how long one is trusted before the category collections are crawled again
+MEMBERSHIP_CACHE_DIR = Path(__file__).parent / ".membership_cache"
+MEMBERSHIP_MAX_AGE = 24 * 60 * 60
 
-def get_keyboards_from_globaliraq() -> List[Dict]:
-    """Fetch Keyboards directly from GlobalIraq's keyboard collection"""
-    keyboard_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/keyboards/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_globaliraq_product(item, is_keyboard=True)
-                if product:
-                    keyboard_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
+def load_category_membership(site_name: str):
+    """Return a site's cached membership map, or None when it is missing or stale"""
+    path = MEMBERSHIP_CACHE_DIR / f"{site_name}.json"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
     
-    return keyboard_products
+    if time.time() - data.get("updated", 0) > MEMBERSHIP_MAX_AGE:
+        return None
+    return data.get("members", {})
 
-def get_power_supply_from_globaliraq() -> List[Dict]:
-    """Fetch Power Supply directly from GlobalIraq's power supply collection"""
-    power_supply_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/power-supply/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_globaliraq_product(item, is_power_supply=True)
-                if product:
-                    power_supply_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return power_supply_products
+def save_category_membership(site_name: str, members: Dict[str, str]) -> None:
+    """Persist a site's membership map for the following runs"""
+    try:
+        MEMBERSHIP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(MEMBERSHIP_CACHE_DIR / f"{site_name}.json", 'w', encoding='utf-8') as f:
+            json.dump({"updated": time.time(), "members": members}, f)
+    except OSError as e:
+        print(f"⚠️ Could not save {site_name} category membership: {e}")
+
+# -------------------- Shopify Crawler --------------------
+# Largest page size Shopify's products.json accepts
+SHOPIFY_PAGE_LIMIT = 250
+
+def get_shopify_collection_pages(context: SiteCrawlContext, handle: str):
+    """Iterate the product lists of every page of a Shopify collection (prefetched concurrently)"""
+    return context.paginate(
+        lambda page: f"{context.base_url}/collections/{handle}/products.json?sort_by=best-selling&limit={SHOPIFY_PAGE_LIMIT}&page={page}",
+        get_json_products,
+        page_size=SHOPIFY_PAGE_LIMIT,
+    )
 
-def get_cases_from_globaliraq() -> List[Dict]:
-    """Fetch Cases directly from GlobalIraq's case collection"""
-    case_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/case/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_globaliraq_product(item, is_case=True)
-                if product:
-                    case_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return case_products
+def crawl_shopify_collection(context: SiteCrawlContext, handle: str, parse_product, membership: Dict[str, str] = None, register: bool = True, **category_flags) -> List[Dict]:
+    """Walk every page of a Shopify collection, registering items into the context as each page arrives
 
-def get_storage_from_globaliraq() -> List[Dict]:
-    """Fetch Storage directly from GlobalIraq's storage collection"""
-    storage_products = []
-    page = 1
+    parse_product is the store's parser (parse_globaliraq_product, parse_alityan_product,
+    parse_altajit_product); category_flags are passed straight through to it.
+    With a membership map, each item instead gets the category flag its ID maps to.
+    Returns the products this collection added (duplicates of earlier ones are skipped).
+    With register=False nothing is registered and every parsed product is returned,
+    for callers crawling several collections at once and registering them in order.
+    """
+    products = []
     
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/storage/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
+    for data in get_shopify_collection_pages(context, handle):
         for item in data:
+            if membership is not None:
+                category_flag = membership.get(str(item.get('id', '')))
+                category_flags = {category_flag: True} if category_flag else {}
+            
             try:
-                product = parse_globaliraq_product(item, is_storage=True)
-                if product:
-                    storage_products.append(product)
+                product = parse_product(item, **category_flags)
+                if product and (not register or context.add(product)):
+                    products.append(product)
             except Exception as e:
                 continue
-        
-        page += 1
-        time.sleep(0.3)
     
-    return storage_products
+    return products
 
-def get_coolers_from_globaliraq() -> List[Dict]:
-    """Fetch Coolers directly from GlobalIraq's cooler collection"""
-    cooler_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/cooling/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_globaliraq_product(item, is_cooler=True)
-                if product:
-                    cooler_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return cooler_products
+def get_shopify_membership(context: SiteCrawlContext, collections: Dict[str, str]) -> Dict[str, str]:
+    """Map Shopify product ID -> category flag, from cache or by listing every category collection
 
-def get_monitors_from_globaliraq() -> List[Dict]:
-    """Fetch Monitors directly from GlobalIraq's monitor collection"""
-    monitor_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/monitor/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_globaliraq_product(item, is_monitor=True)
-                if product:
-                    monitor_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
+    A product listed in several collections keeps the flag of the first one in table order.
+    """
+    membership = load_category_membership(context.site_name)
+    if membership is not None:
+        return membership
     
-    return monitor_products
+    # All collections are listed at once, then merged in table order
+    listings = context.run_concurrently(
+        lambda handle: [str(item.get('id', '')) for data in get_shopify_collection_pages(context, handle) for item in data],
+        collections
+    )
+    membership = {}
+    for category_flag, product_ids in zip(collections.values(), listings):
+        for product_id in product_ids or []:
+            membership.setdefault(product_id, category_flag)
+    
+    # A listing that failed or was cut short marks the crawl partial; a map built
+    # from it would leave those categories' products untagged for a whole day
+    if not context.partial:
+        save_category_membership(context.site_name, membership)
+    return membership
+
+def crawl_shopify_catalog(context: SiteCrawlContext, collections: Dict[str, str], parse_product) -> List[Dict]:
+    """Download a store's whole catalog once via /collections/all, tagging categories from the membership map
+
+    The category collections are only listed again when the cached map is older
+    than MEMBERSHIP_MAX_AGE; until then a product added to a category since the
+    last refresh comes through uncategorized.
+    """
+    membership = get_shopify_membership(context, collections)
+    return crawl_shopify_collection(context, "all", parse_product, membership=membership)
 
-def get_headsets_from_globaliraq() -> List[Dict]:
-    """Fetch Headsets directly from GlobalIraq's headset collection"""
-    headset_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/headsets/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_globaliraq_product(item, is_headset=True)
-                if product:
-                    headset_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return headset_products
+# -------------------- GlobalIraq Scraper --------------------
+# Collection handle -> parse_globaliraq_product category flag
+GLOBALIRAQ_COLLECTIONS = {
+    "ram-memory": "is_ram",
+    "processor": "is_cpu",
+    "motherboard": "is_motherboard",
+    "mice": "is_mouse",
+    "keyboards": "is_keyboard",
+    "power-supply": "is_power_supply",
+    "case": "is_case",
+    "storage": "is_storage",
+    "cooling": "is_cooler",
+    "monitor": "is_monitor",
+    "headsets": "is_headset",
+    "laptop": "is_laptop",
+}
 
 def get_products_from_globaliraq() -> List[Dict]:
-    products = []
+    context = SiteCrawlContext("globaliraq", BASE_URL_GLOBAL)
     
     print("ðŸŒ GlobalIraq: Starting...")
     
-    # Get all products from collections
-    ram_products = get_ram_from_globaliraq()
-    products.extend(ram_products)
+    # Download the whole catalog once; categories come from the collection membership map
+    crawl_shopify_catalog(context, GLOBALIRAQ_COLLECTIONS, parse_globaliraq_product)
     
-    cpu_products = get_cpus_from_globaliraq()
-    products.extend(cpu_products)
-    
-    motherboard_products = get_motherboards_from_globaliraq()
-    products.extend(motherboard_products)
-    
-    mouse_products = get_mice_from_globaliraq()
-    products.extend(mouse_products)
-    
-    keyboard_products = get_keyboards_from_globaliraq()
-    products.extend(keyboard_products)
-    
-    power_supply_products = get_power_supply_from_globaliraq()
-    products.extend(power_supply_products)
-    
-    case_products = get_cases_from_globaliraq()
-    products.extend(case_products)
-    
-    storage_products = get_storage_from_globaliraq()
-    products.extend(storage_products)
-    
-    cooler_products = get_coolers_from_globaliraq()
-    products.extend(cooler_products)
-    
-    monitor_products = get_monitors_from_globaliraq()
-    products.extend(monitor_products)
+    context.report()
+    return context.products
+
+# -------------------- Alityan Scraper --------------------
+# Collection handle -> parse_alityan_product category flag
+ALITYAN_COLLECTIONS = {
+    "gpus": "is_gpu",
+    "ram": "is_ram",
+    "amd": "is_cpu",
+    "motherboards": "is_motherboard",
+    "mouses": "is_mouse",
+    "keyboards": "is_keyboard",
+    "power-supply": "is_power_supply",
+    "case": "is_case",
+    "storage": "is_storage",
+    "coolers": "is_cooler",
+    "moniter": "is_monitor",
+    "headsets": "is_headset",
+}
+
+def get_products_from_alityan() -> List[Dict]:
     
-    headset_products = get_headsets_from_globaliraq()
-    products.extend(headset_products)
+    print("ðŸ›’ Alityan: Starting...")
     
-    laptop_products = get_laptop_from_globaliraq()
-    products.extend(laptop_products)
+    # Initialize session with robust headers and visit homepage
+    context = get_scraper_session(BASE_URL_ALITYAN, "alityan")
     
-    # Get other products from general collection
-    page = 1
-    while True:
-        url = f"{BASE_URL_GLOBAL}/collections/all/products.json?sort_by=best-selling&page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        # Track RAM, CPU, Motherboard, Mouse, Keyboard, Power Supply, Case, Storage, Cooler, Monitor, Headset, Laptop IDs to avoid duplicates
-        ram_ids = {ram.get('id', '').replace('globaliraq-', '') for ram in ram_products}
-        cpu_ids = {cpu.get('id', '').replace('globaliraq-', '') for cpu in cpu_products}
-        motherboard_ids = {mb.get('id', '').replace('globaliraq-', '') for mb in motherboard_products}
-        mouse_ids = {mouse.get('id', '').replace('globaliraq-', '') for mouse in mouse_products}
-        keyboard_ids = {keyboard.get('id', '').replace('globaliraq-', '') for keyboard in keyboard_products}
-        power_supply_ids = {psu.get('id', '').replace('globaliraq-', '') for psu in power_supply_products}
-        case_ids = {case.get('id', '').replace('globaliraq-', '') for case in case_products}
-        storage_ids = {storage.get('id', '').replace('globaliraq-', '') for storage in storage_products}
-        cooler_ids = {cooler.get('id', '').replace('globaliraq-', '') for cooler in cooler_products}
-        monitor_ids = {monitor.get('id', '').replace('globaliraq-', '') for monitor in monitor_products}
-        headset_ids = {headset.get('id', '').replace('globaliraq-', '') for headset in headset_products}
-        laptop_ids = {laptop.get('id', '').replace('globaliraq-', '') for laptop in laptop_products}
-        excluded_ids = ram_ids | cpu_ids | motherboard_ids | mouse_ids | keyboard_ids | power_supply_ids | case_ids | storage_ids | cooler_ids | monitor_ids | headset_ids | laptop_ids
-        
-        for item in data:
-            # Skip if this product is already in our specialized collections
-            if str(item.get('id', '')) in excluded_ids:
-                continue
-                
-            try:
-                product = parse_globaliraq_product(item, is_ram=False, is_cpu=False, is_motherboard=False)
-                if product:
-                    products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
+    # Download the whole catalog once; categories come from the collection membership map
+    crawl_shopify_catalog(context, ALITYAN_COLLECTIONS, parse_alityan_product)
     
-    return products
+    context.report()
+    return context.products
 
-# -------------------- Alityan Scraper --------------------
-def get_gpus_from_alityan(session) -> List[Dict]:
-    """Fetch GPUs directly from Alityan's GPU collection"""
-    gpus = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/gpus/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_gpu=True)
-                if product:
-                    gpus.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return gpus
+# -------------------- Kolshzin Category Extraction --------------------
+# The part of a Kolshzin HTML category page holding its products (li.product)
+KOLSHZIN_LISTING = class_strainer("product", "li")
+
+# Selectors of a Kolshzin HTML category page and its li.product items
+KOLSHZIN_LISTING_SELECTORS = compile_selectors({
+    "product": "li.product",
+    "title": "h2.woocommerce-loop-product__title a",
+    "link": "a.woocommerce-LoopProduct-link",
+    "price_amount": ".price .amount",
+    "price": ".price",
+    "old_price": "del .amount",
+    "image": "img",
+    "out_of_stock": "p.stock.out-of-stock",
+})
 
-def get_ram_from_alityan(session) -> List[Dict]:
-    """Fetch RAM directly from Alityan's RAM collection"""
-    ram_products = []
-    page = 1
+def extract_kolshzin_products_from_page(soup, is_laptop=False):
+    """Extract products from a Kolshzin page"""
+    products = []
+    seen_links = set()
     
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/ram/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
+    for p in KOLSHZIN_LISTING_SELECTORS["product"].select(soup):
+        title_el = KOLSHZIN_LISTING_SELECTORS["title"].select_one(p) or KOLSHZIN_LISTING_SELECTORS["link"].select_one(p)
+        new_price_el = KOLSHZIN_LISTING_SELECTORS["price_amount"].select_one(p) or KOLSHZIN_LISTING_SELECTORS["price"].select_one(p)
+        old_price_el = KOLSHZIN_LISTING_SELECTORS["old_price"].select_one(p)
+
+        title = title_el.text.strip() if title_el else "Unknown"
+        new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
+        old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
+
+        price_data = parse_price(new_price_text)
+        compare_price_data = parse_price(old_price_text) if old_price_text else None
+
+        price = price_data['numeric_value']
+        old_price = compare_price_data['numeric_value'] if compare_price_data else None
         
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_ram=True)
-                if product:
-                    ram_products.append(product)
-            except Exception as e:
-                continue
+        normalized_compare_price = None
+        if compare_price_data and compare_price_data['numeric_value'] > price:
+            normalized_compare_price = old_price
         
-        page += 1
-        time.sleep(0.3)
-    
-    return ram_products
+        discount = calculate_discount(normalized_compare_price or 0, price) if normalized_compare_price else 0
 
-def get_cpus_from_alityan(session) -> List[Dict]:
-    """Fetch CPUs directly from Alityan's CPU collection"""
-    cpu_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/amd/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_cpu=True)
-                if product:
-                    cpu_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return cpu_products
-
-def get_motherboards_from_alityan(session) -> List[Dict]:
-    """Fetch Motherboards directly from Alityan's motherboards collection"""
-    motherboard_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/motherboards/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_motherboard=True)
-                if product:
-                    motherboard_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return motherboard_products
-
-def get_mice_from_alityan(session) -> List[Dict]:
-    """Fetch Mice directly from Alityan's mouse collection"""
-    mouse_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/mouses/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_mouse=True)
-                if product:
-                    mouse_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return mouse_products
-
-def get_keyboards_from_alityan(session) -> List[Dict]:
-    """Fetch Keyboards directly from Alityan's keyboard collection"""
-    keyboard_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/keyboards/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_keyboard=True)
-                if product:
-                    keyboard_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return keyboard_products
-
-def get_power_supply_from_alityan(session) -> List[Dict]:
-    """Fetch Power Supply directly from Alityan's power supply collection"""
-    power_supply_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/power-supply/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_power_supply=True)
-                if product:
-                    power_supply_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return power_supply_products
-
-def get_cases_from_alityan(session) -> List[Dict]:
-    """Fetch Cases directly from Alityan's case collection"""
-    case_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/case/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_case=True)
-                if product:
-                    case_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return case_products
-
-def get_storage_from_alityan(session) -> List[Dict]:
-    """Fetch Storage directly from Alityan's storage collection"""
-    storage_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/storage/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_storage=True)
-                if product:
-                    storage_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return storage_products
-
-def get_coolers_from_alityan(session) -> List[Dict]:
-    """Fetch Coolers directly from Alityan's cooler collection"""
-    cooler_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/coolers/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_cooler=True)
-                if product:
-                    cooler_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return cooler_products
-
-def get_monitors_from_alityan(session) -> List[Dict]:
-    """Fetch Monitors directly from Alityan's monitor collection"""
-    monitor_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/moniter/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_monitor=True)
-                if product:
-                    monitor_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return monitor_products
-
-def get_headsets_from_alityan(session) -> List[Dict]:
-    """Fetch Headsets directly from Alityan's headset collection"""
-    headset_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/headsets/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_alityan_product(item, is_headset=True)
-                if product:
-                    headset_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return headset_products
-
-def get_products_from_alityan() -> List[Dict]:
-    products = []
-    
-    print("ðŸ›’ Alityan: Starting...")
-    
-    # Initialize session with robust headers and visit homepage
-    session = get_scraper_session(BASE_URL_ALITYAN)
-    
-    # Get all products from collections
-    gpu_products = get_gpus_from_alityan(session)
-    products.extend(gpu_products)
-    
-    ram_products = get_ram_from_alityan(session)
-    products.extend(ram_products)
-    
-    cpu_products = get_cpus_from_alityan(session)
-    products.extend(cpu_products)
-    
-    motherboard_products = get_motherboards_from_alityan(session)
-    products.extend(motherboard_products)
-    
-    mouse_products = get_mice_from_alityan(session)
-    products.extend(mouse_products)
-    
-    keyboard_products = get_keyboards_from_alityan(session)
-    products.extend(keyboard_products)
-    
-    power_supply_products = get_power_supply_from_alityan(session)
-    products.extend(power_supply_products)
-    
-    case_products = get_cases_from_alityan(session)
-    products.extend(case_products)
-    
-    storage_products = get_storage_from_alityan(session)
-    products.extend(storage_products)
-    
-    cooler_products = get_coolers_from_alityan(session)
-    products.extend(cooler_products)
-    
-    monitor_products = get_monitors_from_alityan(session)
-    products.extend(monitor_products)
-    
-    headset_products = get_headsets_from_alityan(session)
-    products.extend(headset_products)
-    
-    # Get other products from general collection
-    page = 1
-    while True:
-        url = f"{BASE_URL_ALITYAN}/collections/all/products.json?sort_by=best-selling&page={page}"
-        res = session.get(url)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        # Track GPU, RAM, CPU, Motherboard, Mouse, Keyboard, Power Supply, Case, Storage, Cooler, Monitor, Headset IDs to avoid duplicates
-        gpu_ids = {gpu.get('id', '').replace('alityan-', '') for gpu in gpu_products}
-        ram_ids = {ram.get('id', '').replace('alityan-', '') for ram in ram_products}
-        cpu_ids = {cpu.get('id', '').replace('alityan-', '') for cpu in cpu_products}
-        motherboard_ids = {mb.get('id', '').replace('alityan-', '') for mb in motherboard_products}
-        mouse_ids = {mouse.get('id', '').replace('alityan-', '') for mouse in mouse_products}
-        keyboard_ids = {keyboard.get('id', '').replace('alityan-', '') for keyboard in keyboard_products}
-        power_supply_ids = {psu.get('id', '').replace('alityan-', '') for psu in power_supply_products}
-        case_ids = {case.get('id', '').replace('alityan-', '') for case in case_products}
-        storage_ids = {storage.get('id', '').replace('alityan-', '') for storage in storage_products}
-        cooler_ids = {cooler.get('id', '').replace('alityan-', '') for cooler in cooler_products}
-        monitor_ids = {monitor.get('id', '').replace('alityan-', '') for monitor in monitor_products}
-        headset_ids = {headset.get('id', '').replace('alityan-', '') for headset in headset_products}
-        excluded_ids = gpu_ids | ram_ids | cpu_ids | motherboard_ids | mouse_ids | keyboard_ids | power_supply_ids | case_ids | storage_ids | cooler_ids | monitor_ids | headset_ids
-        
-        for item in data:
-            # Skip if this product is already in our specialized collections
-            if str(item.get('id', '')) in excluded_ids:
-                continue
-                
-            try:
-                product = parse_alityan_product(item, is_gpu=False, is_ram=False, is_cpu=False, is_motherboard=False)
-                if product:
-                    products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return products
-
-# -------------------- Kolshzin Category Extraction --------------------
-def extract_kolshzin_products_from_page(soup, is_laptop=False):
-    """Extract products from a Kolshzin page"""
-    products = []
-    seen_links = set()
-    
-    for p in soup.select("li.product"):
-        title_el = p.select_one("h2.woocommerce-loop-product__title a") or p.select_one("a.woocommerce-LoopProduct-link")
-        new_price_el = p.select_one(".price .amount") or p.select_one(".price")
-        old_price_el = p.select_one("del .amount")
-
-        title = title_el.text.strip() if title_el else "Unknown"
-        new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-        old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-        price_data = parse_price(new_price_text)
-        compare_price_data = parse_price(old_price_text) if old_price_text else None
-
-        price = price_data['numeric_value']
-        old_price = compare_price_data['numeric_value'] if compare_price_data else None
-        
-        normalized_compare_price = None
-        if compare_price_data and compare_price_data['numeric_value'] > price:
-            normalized_compare_price = old_price
-        
-        discount = calculate_discount(normalized_compare_price or 0, price) if normalized_compare_price else 0
-
-        img_el = p.select_one("img")
+        img_el = KOLSHZIN_LISTING_SELECTORS["image"].select_one(p)
         image_url = img_el.get("data-src") or img_el.get("src") if img_el else ""
 
-        stock_el = p.select_one("p.stock.out-of-stock")
+        stock_el = KOLSHZIN_LISTING_SELECTORS["out_of_stock"].select_one(p)
         in_stock = stock_el is None
 
         # Set category based on is_laptop flag
@@ -1235,117 +631,157 @@ def extract_kolshzin_category(product_element):
     return 'Other'
 
 # -------------------- Kolshzin Scraper --------------------
-def get_products_from_kolshzin() -> List[Dict]:
-    products = []
-    seen_links = set()
+# Category listings with the category forced onto their products (None: detect it from CSS classes).
+# Order matters: a product listed in several categories keeps the first one's category
+KOLSHZIN_CATEGORIES = [
+    {"url": f"{BASE_URL_KOLSHZIN}/product-category/hardware-components/pc-components/", "force_category": None},
+    {"url": "https://kolshzin.com/product-category/%d9%85%d9%86%d8%aa%d8%ac%d8%a7%d8%aa-%d8%ba%d9%8a%d8%ba%d8%a7%d8%a8%d8%a7%d9%8a%d8%aa-gigabyte-iraq/", "force_category": None},
+    {"url": "https://kolshzin.com/product-category/computer-office/input-devices/keyboards/", "force_category": "Keyboard"},
+    {"url": "https://kolshzin.com/product-category/computer-office/input-devices/mouse/", "force_category": "Mouse"},
+    {"url": "https://kolshzin.com/product-category/hardware-components/cooling/", "force_category": "Cooler"},
+    {"url": "https://kolshzin.com/product-category/%d9%85%d9%86%d8%aa%d8%ac%d8%a7%d8%aa-%d8%b3%d8%a7%d9%85%d8%b3%d9%88%d9%86%d8%ac-samsung-%d8%a7%d9%84%d8%b9%d8%b1%d8%a7%d9%82/%d8%b4%d8%a7%d8%b4%d8%a7%d8%aa-%d8%b3%d8%a7%d9%85%d8%b3%d9%88%d9%86%d8%ac-samsung/", "force_category": "Monitor"},
+    {"url": "https://kolshzin.com/product-category/asus/asus-monitors/", "force_category": "Monitor"},
+    {"url": "https://kolshzin.com/product-category/%d9%85%d9%86%d8%aa%d8%ac%d8%a7%d8%aa-%d8%ba%d9%8a%d8%ba%d8%a7%d8%a8%d8%a7%d9%8a%d8%aa-gigabyte-iraq/gigabyte-monitors/", "force_category": "Monitor"},
+    {"url": "https://kolshzin.com/product-category/msi-monitors/", "force_category": "Monitor"},
+    {"url": "https://kolshzin.com/product-category/lg-monitors/", "force_category": "Monitor"},
+    {"url": "https://kolshzin.com/product-category/monitor-holders-stands/", "force_category": "Monitor"},
+    {"url": "https://kolshzin.com/product-category/hisense-monitors/", "force_category": "Monitor"},
+    {"url": "https://kolshzin.com/product-category/dell-monitors/", "force_category": "Monitor"},
+    {"url": "https://kolshzin.com/product-category/hp-monitors/", "force_category": "Monitor"},
+    {"url": "https://kolshzin.com/product-category/xiaomi-tvs/", "force_category": "Monitor"},
+    {"url": "https://kolshzin.com/product-category/computer-office/computer-headphones/", "force_category": "Headset"},
+    {"url": "https://kolshzin.com/product-category/steelseries/", "force_category": "Headset"},
+    {"url": "https://kolshzin.com/product-category/laptops/", "force_category": "Laptop"}
+]
+
+# REMOVED PC-COMPONENTS SPECIFIC URLS FOR TESTING CSS AUTO-DETECTION:
+# {"url": "https://kolshzin.com/product-category/hardware-components/pc-components/pc-power-supply-unit/", "force_category": "Power Supply"},
+# {"url": "https://kolshzin.com/product-category/hardware-components/pc-components/cases/", "force_category": "Case"},  
+# {"url": "https://kolshzin.com/product-category/hardware-components/pc-components/ssd-drive/?per_page=150", "force_category": "Storage"},
+# {"url": "https://kolshzin.com/product-category/hardware-components/pc-components/hdd-drive/?per_page=150", "force_category": "Storage"}
+
+# The part of a Kolshzin ajax listing page that is parsed: its product grid items
+KOLSHZIN_GRID = class_strainer("product-grid-item")
+
+# Selectors of a Kolshzin ajax listing page and its product grid items
+KOLSHZIN_SELECTORS = compile_selectors({
+    "grid_item": ".product-grid-item",
+    "title": "h3 a",
+    "sale_price": ".price ins bdi",
+    "price": ".price bdi",
+    "old_price": "del bdi",
+    "image": "img",
+    "out_of_stock": "p.stock.out-of-stock",
+})
+
+def parse_kolshzin_grid_item(p, force_category: str = None) -> Dict:
+    """Parse one .product-grid-item of a Kolshzin ajax listing page"""
+    title_el = KOLSHZIN_SELECTORS["title"].select_one(p)
+    new_price_el = KOLSHZIN_SELECTORS["sale_price"].select_one(p) or KOLSHZIN_SELECTORS["price"].select_one(p)
+    old_price_el = KOLSHZIN_SELECTORS["old_price"].select_one(p)
+
+    title = title_el.text.strip() if title_el else "Unknown"
+    new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
+    old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
+
+    price_data = parse_price(new_price_text)
+    compare_price_data = parse_price(old_price_text) if old_price_text else None
+
+    price = price_data['numeric_value']
+    old_price = compare_price_data['numeric_value'] if compare_price_data else None
     
-    print("ðŸ”§ Kolshzin: Starting...")
+    normalized_compare_price = None
+    if compare_price_data and compare_price_data['numeric_value'] > price:
+        normalized_compare_price = old_price
     
-    categories = [
-        {"url": f"{BASE_URL_KOLSHZIN}/product-category/hardware-components/pc-components/", "force_category": None},
-        {"url": "https://kolshzin.com/product-category/%d9%85%d9%86%d8%aa%d8%ac%d8%a7%d8%aa-%d8%ba%d9%8a%d8%ba%d8%a7%d8%a8%d8%a7%d9%8a%d8%aa-gigabyte-iraq/", "force_category": None},
-        {"url": "https://kolshzin.com/product-category/computer-office/input-devices/keyboards/", "force_category": "Keyboard"},
-        {"url": "https://kolshzin.com/product-category/computer-office/input-devices/mouse/", "force_category": "Mouse"},
-        {"url": "https://kolshzin.com/product-category/hardware-components/cooling/", "force_category": "Cooler"},
-        {"url": "https://kolshzin.com/product-category/%d9%85%d9%86%d8%aa%d8%ac%d8%a7%d8%aa-%d8%b3%d8%a7%d9%85%d8%b3%d9%88%d9%86%d8%ac-samsung-%d8%a7%d9%84%d8%b9%d8%b1%d8%a7%d9%82/%d8%b4%d8%a7%d8%b4%d8%a7%d8%aa-%d8%b3%d8%a7%d9%85%d8%b3%d9%88%d9%86%d8%ac-samsung/", "force_category": "Monitor"},
-        {"url": "https://kolshzin.com/product-category/asus/asus-monitors/", "force_category": "Monitor"},
-        {"url": "https://kolshzin.com/product-category/%d9%85%d9%86%d8%aa%d8%ac%d8%a7%d8%aa-%d8%ba%d9%8a%d8%ba%d8%a7%d8%a8%d8%a7%d9%8a%d8%aa-gigabyte-iraq/gigabyte-monitors/", "force_category": "Monitor"},
-        {"url": "https://kolshzin.com/product-category/msi-monitors/", "force_category": "Monitor"},
-        {"url": "https://kolshzin.com/product-category/lg-monitors/", "force_category": "Monitor"},
-        {"url": "https://kolshzin.com/product-category/monitor-holders-stands/", "force_category": "Monitor"},
-        {"url": "https://kolshzin.com/product-category/hisense-monitors/", "force_category": "Monitor"},
-        {"url": "https://kolshzin.com/product-category/dell-monitors/", "force_category": "Monitor"},
-        {"url": "https://kolshzin.com/product-category/hp-monitors/", "force_category": "Monitor"},
-        {"url": "https://kolshzin.com/product-category/xiaomi-tvs/", "force_category": "Monitor"},
-        {"url": "https://kolshzin.com/product-category/computer-office/computer-headphones/", "force_category": "Headset"},
-        {"url": "https://kolshzin.com/product-category/steelseries/", "force_category": "Headset"},
-        {"url": "https://kolshzin.com/product-category/laptops/", "force_category": "Laptop"}
-    ]
-    
-    # REMOVED PC-COMPONENTS SPECIFIC URLS FOR TESTING CSS AUTO-DETECTION:
-    # {"url": "https://kolshzin.com/product-category/hardware-components/pc-components/pc-power-supply-unit/", "force_category": "Power Supply"},
-    # {"url": "https://kolshzin.com/product-category/hardware-components/pc-components/cases/", "force_category": "Case"},  
-    # {"url": "https://kolshzin.com/product-category/hardware-components/pc-components/ssd-drive/?per_page=150", "force_category": "Storage"},
-    # {"url": "https://kolshzin.com/product-category/hardware-components/pc-components/hdd-drive/?per_page=150", "force_category": "Storage"}
-    
-    for i, category in enumerate(categories, 1):
-        category_url = category["url"]
-        force_category = category["force_category"]
-        page = 1
-        last_html = None
-
-        while True:
-            url = f"{category_url}?_ajax_get_product=1&paged={page}&per_page=150"
-            res = requests.get(url, headers=HEADERS)
-            html = res.text.strip()
-            if html == last_html:
-                break
-            last_html = html
+    discount = calculate_discount(normalized_compare_price or 0, price) if normalized_compare_price else 0
 
-            soup = BeautifulSoup(html, "html.parser")
-            items = soup.select(".product-grid-item")
-            if not items:
-                break
+    img_el = KOLSHZIN_SELECTORS["image"].select_one(p)
+    image_url = img_el.get("data-src") or img_el.get("src") if img_el else ""
 
-            for p in items:
-                title_el = p.select_one("h3 a")
-                new_price_el = p.select_one(".price ins bdi") or p.select_one(".price bdi")
-                old_price_el = p.select_one("del bdi")
+    stock_el = KOLSHZIN_SELECTORS["out_of_stock"].select_one(p)
+    in_stock = stock_el is None
 
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
+    # Use force_category if specified, otherwise detect from CSS
+    if force_category:
+        category = force_category
+    else:
+        category = extract_kolshzin_category(p)
 
-                price_data = parse_price(new_price_text)
-                compare_price_data = parse_price(old_price_text) if old_price_text else None
+    product_link = title_el["href"] if title_el else ""
 
-                price = price_data['numeric_value']
-                old_price = compare_price_data['numeric_value'] if compare_price_data else None
-                
-                normalized_compare_price = None
-                if compare_price_data and compare_price_data['numeric_value'] > price:
-                    normalized_compare_price = old_price
-                
-                discount = calculate_discount(normalized_compare_price or 0, price) if normalized_compare_price else 0
+    return {
+        "id": f"kolshzin-{hashlib.md5(f'{title}_kolshzin'.encode()).hexdigest()[:16]}",
+        "title": title,
+        "price": price,
+        "old_price": normalized_compare_price,
+        "raw_price": new_price_text,
+        "raw_old_price": old_price_text if normalized_compare_price else None,
+        "detected_currency": 'IQD',
+        "discount": discount,
+        "store": "Kolshzin",
+        "link": product_link,
+        "image": image_url,
+        "in_stock": in_stock,
+        "category": category
+    }
 
-                img_el = p.select_one("img")
-                image_url = img_el.get("data-src") or img_el.get("src") if img_el else ""
+def get_kolshzin_item_link(p) -> str:
+    title_el = KOLSHZIN_SELECTORS["title"].select_one(p)
+    return title_el["href"] if title_el else ""
 
-                stock_el = p.select_one("p.stock.out-of-stock")
-                in_stock = stock_el is None
+def get_kolshzin_grid_items(res) -> list:
+    """Product grid items of one Kolshzin ajax listing page"""
+    if res.status_code != 200:
+        return []
+    return KOLSHZIN_SELECTORS["grid_item"].select(make_soup(res.text, KOLSHZIN_GRID))
 
-                # Use force_category if specified, otherwise detect from CSS
-                if force_category:
-                    category = force_category
-                else:
-                    category = extract_kolshzin_category(p)
+def crawl_kolshzin_category(context: SiteCrawlContext, category_url: str, force_category: str = None) -> List[Dict]:
+    """Walk one Kolshzin category through its ajax listing and return its products in page order
 
-                product_link = title_el["href"] if title_el else ""
-                if product_link and product_link in seen_links:
-                    continue
-                seen_links.add(product_link)
-
-                products.append({
-                    "id": f"kolshzin-{hashlib.md5(f'{title}_kolshzin'.encode()).hexdigest()[:16]}",
-                    "title": title,
-                    "price": price,
-                    "old_price": normalized_compare_price,
-                    "raw_price": new_price_text,
-                    "raw_old_price": old_price_text if normalized_compare_price else None,
-                    "detected_currency": 'IQD',
-                    "discount": discount,
-                    "store": "Kolshzin",
-                    "link": product_link,
-                    "image": image_url,
-                    "in_stock": in_stock,
-                    "category": category
-                })
-            
-            page += 1
-            time.sleep(0.3)
+    Past the last page the endpoint keeps answering with the same products, so a
+    page is compared with the previous one by a fingerprint of its product links
+    (not the whole HTML) and a repeat ends the walk.
+    """
+    products = []
+    last_fingerprint = None
+
+    def get_new_grid_items(res) -> list:
+        nonlocal last_fingerprint
+        items = get_kolshzin_grid_items(res)
+        fingerprint = hashlib.sha1("\n".join(get_kolshzin_item_link(p) for p in items).encode("utf-8")).hexdigest()
+        if fingerprint == last_fingerprint:
+            return []
+        last_fingerprint = fingerprint
+        return items
+
+    # Pages are large (per_page=150), so only one is fetched ahead of the one being parsed
+    for items in context.paginate(lambda page: f"{category_url}?_ajax_get_product=1&paged={page}&per_page=150", get_new_grid_items, window=2):
+        for p in items:
+            products.append(parse_kolshzin_grid_item(p, force_category))
     
     return products
 
+def get_products_from_kolshzin() -> List[Dict]:
+    context = SiteCrawlContext("kolshzin", BASE_URL_KOLSHZIN)
+    
+    print("ðŸ”§ Kolshzin: Starting...")
+    
+    # All categories at once; wall time is roughly the slowest category instead of their sum
+    category_products = context.run_concurrently(
+        lambda category: crawl_kolshzin_category(context, category["url"], category["force_category"]),
+        KOLSHZIN_CATEGORIES
+    )
+    
+    # Register into the shared seen-links index in table order, so which category
+    # a product listed in several of them gets does not depend on timing
+    for products in category_products:
+        for product in products or []:
+            context.add(product, product["link"])
+    
+    context.report()
+    return context.products
+
 # -------------------- JokerCenter Parser --------------------
 
 def parse_spniq_product(item: Dict, is_gpu: bool = False, is_ram: bool = False, is_cpu: bool = False, is_motherboard: bool = False, is_mouse: bool = False, is_keyboard: bool = False, is_power_supply: bool = False, is_case: bool = False, is_storage: bool = False, is_cooler: bool = False, is_monitor: bool = False, is_headset: bool = False, is_laptop: bool = False) -> Dict:
@@ -1454,6 +890,29 @@ def parse_spniq_product(item: Dict, is_gpu: bool = False, is_ram: bool = False,
         print(f"Error parsing spniq product: {e}")
         return None
 
+# parse_jokercenter_product category flag -> category name, in priority order
+JOKERCENTER_FLAG_CATEGORIES = {
+    "is_gpu": "GPU",
+    "is_ram": "RAM",
+    "is_cpu": "CPU",
+    "is_motherboard": "Motherboards",
+    "is_mouse": "Mouse",
+    "is_keyboard": "Keyboard",
+    "is_power_supply": "Power Supply",
+    "is_case": "Case",
+    "is_storage": "Storage",
+    "is_cooler": "Cooler",
+    "is_monitor": "Monitor",
+    "is_headset": "Headset",
+}
+
+def get_jokercenter_item_category(item: Dict) -> str:
+    """API category name of a JokerCenter item (plain string or {"name": ...} object)"""
+    category = item.get("category", "")
+    if isinstance(category, dict):
+        category = category.get("name", "")
+    return category or ""
+
 def parse_jokercenter_product(item: Dict, is_gpu: bool = False, is_ram: bool = False, is_cpu: bool = False, is_motherboard: bool = False, is_mouse: bool = False, is_keyboard: bool = False, is_power_supply: bool = False, is_case: bool = False, is_storage: bool = False, is_cooler: bool = False, is_monitor: bool = False, is_headset: bool = False) -> Dict:
     """Parse a single product from JokerCenter API response"""
     try:
@@ -1466,7 +925,7 @@ def parse_jokercenter_product(item: Dict, is_gpu: bool = False, is_ram: bool = F
         image_url = item.get("imageUrl", "")
         images = item.get("images", [])
         quantity = item.get("quantity", 0)
-        category = item.get("category", "")
+        category = get_jokercenter_item_category(item)
 
         # Handle pricing and discounts
         if isinstance(price, (int, float)):
@@ -1503,31 +962,20 @@ def parse_jokercenter_product(item: Dict, is_gpu: bool = False, is_ram: bool = F
             product_data["old_price"] = original_price
             product_data["discount_percentage"] = discount_percentage
 
-        # Set category based on flags
-        if is_gpu:
-            product_data["category"] = "GPU"
-        elif is_ram:
-            product_data["category"] = "RAM"
-        elif is_cpu:
-            product_data["category"] = "CPU"
-        elif is_motherboard:
-            product_data["category"] = "Motherboards"
-        elif is_mouse:
-            product_data["category"] = "Mouse"
-        elif is_keyboard:
-            product_data["category"] = "Keyboard"
-        elif is_power_supply:
-            product_data["category"] = "Power Supply"
-        elif is_case:
-            product_data["category"] = "Case"
-        elif is_storage:
-            product_data["category"] = "Storage"
-        elif is_cooler:
-            product_data["category"] = "Cooler"
-        elif is_monitor:
-            product_data["category"] = "Monitor"
-        elif is_headset:
-            product_data["category"] = "Headset"
+        # Set category based on flags; items from catalog-wide pages get no flag,
+        # so their own API category is mapped locally instead
+        category_flags = {
+            "is_gpu": is_gpu, "is_ram": is_ram, "is_cpu": is_cpu, "is_motherboard": is_motherboard,
+            "is_mouse": is_mouse, "is_keyboard": is_keyboard, "is_power_supply": is_power_supply,
+            "is_case": is_case, "is_storage": is_storage, "is_cooler": is_cooler,
+            "is_monitor": is_monitor, "is_headset": is_headset,
+        }
+        if not any(category_flags.values()) and category in JOKERCENTER_CATEGORIES:
+            category_flags[JOKERCENTER_CATEGORIES[category]] = True
+        for flag, category_name in JOKERCENTER_FLAG_CATEGORIES.items():
+            if category_flags[flag]:
+                product_data["category"] = category_name
+                break
 
         return product_data
 
@@ -1536,373 +984,131 @@ def parse_jokercenter_product(item: Dict, is_gpu: bool = False, is_ram: bool = F
         return None
 
 # -------------------- JokerCenter Scrapers --------------------
+# API category name -> parse_jokercenter_product category flag
+JOKERCENTER_CATEGORIES = {
+    "Graphics Cards": "is_gpu",
+    "CPUs": "is_cpu",
+    "Motherboards": "is_motherboard",
+    "Storage": "is_storage",
+    "Cases": "is_case",
+    "Power Supplies": "is_power_supply",
+    "Coolers": "is_cooler",
+    "Keyboards": "is_keyboard",
+    "Mice": "is_mouse",
+    "OLED Monitor": "is_monitor",
+    "Gaming Monitor": "is_monitor",
+    "Monitor Arm": "is_monitor",
+    "Headsets": "is_headset",
+}
 
-def get_gpu_from_jokercenter() -> List[Dict]:
-    """Fetch Graphics Cards from JokerCenter API"""
-    gpu_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_JOKERCENTER}/api/products?category=Graphics Cards&page={page}&limit=50"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_jokercenter_product(item, is_gpu=True)
-                if product:
-                    gpu_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return gpu_products
-
-def get_cpu_from_jokercenter() -> List[Dict]:
-    """Fetch CPUs from JokerCenter API"""
-    cpu_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_JOKERCENTER}/api/products?category=CPUs&page={page}&limit=50"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_jokercenter_product(item, is_cpu=True)
-                if product:
-                    cpu_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return cpu_products
-
-def get_motherboards_from_jokercenter() -> List[Dict]:
-    """Fetch Motherboards from JokerCenter API"""
-    motherboard_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_JOKERCENTER}/api/products?category=Motherboards&page={page}&limit=50"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_jokercenter_product(item, is_motherboard=True)
-                if product:
-                    motherboard_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return motherboard_products
+# Page sizes tried against the API, largest first; the first one it answers becomes the run's page size
+JOKERCENTER_PAGE_SIZES = (1000, 500, 250, 100, 50)
 
-def get_storage_from_jokercenter() -> List[Dict]:
-    """Fetch Storage from JokerCenter API"""
-    storage_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_JOKERCENTER}/api/products?category=Storage&page={page}&limit=50"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_jokercenter_product(item, is_storage=True)
-                if product:
-                    storage_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return storage_products
+def jokercenter_products_url(page: int, limit: int, category: str = None) -> str:
+    url = f"{BASE_URL_JOKERCENTER}/api/products?page={page}&limit={limit}"
+    return f"{url}&category={category}" if category else url
 
-def get_cases_from_jokercenter() -> List[Dict]:
-    """Fetch Cases from JokerCenter API"""
-    case_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_JOKERCENTER}/api/products?category=Cases&page={page}&limit=50"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_jokercenter_product(item, is_case=True)
-                if product:
-                    case_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return case_products
+def probe_jokercenter_catalog(context: SiteCrawlContext):
+    """Find the largest page size the API accepts, using the catalog-wide query
 
-def get_power_supply_from_jokercenter() -> List[Dict]:
-    """Fetch Power Supplies from JokerCenter API"""
-    psu_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_JOKERCENTER}/api/products?category=Power Supplies&page={page}&limit=50"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_jokercenter_product(item, is_power_supply=True)
-                if product:
-                    psu_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return psu_products
+    Returns (page_size, first_page_items). The page size is how many items the
+    API actually returned, so a server that clamps the limit still pages right.
+    Returns (50, None) when no size works, i.e. the old per-category limit.
+    Sizes are tried with single probes: an API rejecting a size with a 5xx must
+    not open the host's circuit for the real queries that follow.
+    """
+    for limit in JOKERCENTER_PAGE_SIZES:
+        try:
+            items = get_json_products(context.probe(jokercenter_products_url(1, limit)))
+        except Exception as e:
+            continue
+        if items:
+            return len(items), items
+    return 50, None
 
-def get_coolers_from_jokercenter() -> List[Dict]:
-    """Fetch Coolers from JokerCenter API"""
-    cooler_products = []
-    page = 1
+def crawl_jokercenter_category(context: SiteCrawlContext, category: str, page_size: int = 50, **category_flags) -> List[Dict]:
+    """Page through one JokerCenter API category and return its products"""
+    products = []
     
-    while True:
-        url = f"{BASE_URL_JOKERCENTER}/api/products?category=Coolers&page={page}&limit=50"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
+    for data in context.paginate(lambda page: jokercenter_products_url(page, page_size, category), get_json_products, page_size=page_size):
         for item in data:
             try:
-                product = parse_jokercenter_product(item, is_cooler=True)
+                product = parse_jokercenter_product(item, **category_flags)
                 if product:
-                    cooler_products.append(product)
+                    products.append(product)
             except Exception as e:
                 continue
-        
-        page += 1
-        time.sleep(0.3)
     
-    return cooler_products
+    return products
 
-def get_keyboards_from_jokercenter() -> List[Dict]:
-    """Fetch Keyboards from JokerCenter API"""
-    keyboard_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_JOKERCENTER}/api/products?category=Keyboards&page={page}&limit=50"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_jokercenter_product(item, is_keyboard=True)
-                if product:
-                    keyboard_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return keyboard_products
+def crawl_jokercenter_catalog(context: SiteCrawlContext, page_size: int, first_page: List[Dict]) -> List[Dict]:
+    """Page through the whole catalog once, keeping the items of the categories we track
 
-def get_mice_from_jokercenter() -> List[Dict]:
-    """Fetch Mice from JokerCenter API"""
-    mouse_products = []
-    page = 1
+    parse_jokercenter_product maps each item's own API category locally.
+    """
+    def pages():
+        yield first_page
+        yield from context.paginate(lambda page: jokercenter_products_url(page, page_size), get_json_products, start=2, page_size=page_size)
     
-    while True:
-        url = f"{BASE_URL_JOKERCENTER}/api/products?category=Mice&page={page}&limit=50"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
+    products = []
+    for data in pages():
         for item in data:
             try:
-                product = parse_jokercenter_product(item, is_mouse=True)
-                if product:
-                    mouse_products.append(product)
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return mouse_products
-
-def get_monitors_from_jokercenter() -> List[Dict]:
-    """Fetch Monitors from JokerCenter API - multiple categories"""
-    monitor_products = []
-    
-    # Monitor categories to scrape
-    monitor_categories = ["OLED Monitor", "Gaming Monitor", "Monitor Arm"]
-    
-    for category in monitor_categories:
-        page = 1
-        while True:
-            url = f"{BASE_URL_JOKERCENTER}/api/products?category={category}&page={page}&limit=50"
-            res = requests.get(url, headers=HEADERS)
-            if res.status_code != 200:
-                break
-            
-            data = res.json().get("products", [])
-            if not data:
-                break
-            
-            for item in data:
-                try:
-                    product = parse_jokercenter_product(item, is_monitor=True)
-                    if product:
-                        monitor_products.append(product)
-                except Exception as e:
+                if get_jokercenter_item_category(item) not in JOKERCENTER_CATEGORIES:
                     continue
-            
-            page += 1
-            time.sleep(0.3)
-    
-    return monitor_products
-
-def get_headsets_from_jokercenter() -> List[Dict]:
-    """Fetch Headsets from JokerCenter API"""
-    headset_products = []
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_JOKERCENTER}/api/products?category=Headsets&page={page}&limit=50"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        data = res.json().get("products", [])
-        if not data:
-            break
-        
-        for item in data:
-            try:
-                product = parse_jokercenter_product(item, is_headset=True)
+                product = parse_jokercenter_product(item)
                 if product:
-                    headset_products.append(product)
+                    products.append(product)
             except Exception as e:
                 continue
-        
-        page += 1
-        time.sleep(0.3)
     
-    return headset_products
+    return products
 
 def get_products_from_jokercenter() -> List[Dict]:
     """Main function to get all products from JokerCenter"""
-    products = []
+    context = SiteCrawlContext("jokercenter", BASE_URL_JOKERCENTER)
     
     print("ðŸƒ JokerCenter: Starting...", flush=True)
     
-    # Moved print statement to beginning of function
-    
-    # Get products from all categories
-    gpu_products = get_gpu_from_jokercenter()
-    products.extend(gpu_products)
-    
-    cpu_products = get_cpu_from_jokercenter()
-    products.extend(cpu_products)
-    
-    motherboard_products = get_motherboards_from_jokercenter()
-    products.extend(motherboard_products)
-    
-    storage_products = get_storage_from_jokercenter()
-    products.extend(storage_products)
-    
-    case_products = get_cases_from_jokercenter()
-    products.extend(case_products)
-    
-    power_supply_products = get_power_supply_from_jokercenter()
-    products.extend(power_supply_products)
+    page_size, first_page = probe_jokercenter_catalog(context)
     
-    cooler_products = get_coolers_from_jokercenter()
-    products.extend(cooler_products)
-    
-    keyboard_products = get_keyboards_from_jokercenter()
-    products.extend(keyboard_products)
-    
-    mouse_products = get_mice_from_jokercenter()
-    products.extend(mouse_products)
-    
-    monitor_products = get_monitors_from_jokercenter()
-    products.extend(monitor_products)
-    
-    headset_products = get_headsets_from_jokercenter()
-    products.extend(headset_products)
-    
-    return products
+    # One walk over the whole catalog when its items say which category they belong to
+    if first_page and any(get_jokercenter_item_category(item) in JOKERCENTER_CATEGORIES for item in first_page):
+        print(f"  JokerCenter: paging the whole catalog, {page_size} products per page")
+        for product in crawl_jokercenter_catalog(context, page_size, first_page):
+            context.add(product)
+    else:
+        # Otherwise every category query at once, with the largest page size the API took
+        category_products = context.run_concurrently(
+            lambda category: crawl_jokercenter_category(context, category[0], page_size, **{category[1]: True}),
+            list(JOKERCENTER_CATEGORIES.items())
+        )
+        for products in category_products:
+            for product in products or []:
+                context.add(product)
+    
+    context.report()
+    return context.products
 
 # -------------------- spniq Scrapers --------------------
 
-def get_gpu_from_spniq() -> List[Dict]:
-    """Fetch Graphics Cards from spniq API"""
-    gpu_products = []
-    
+# Category title in the /categories payload -> parse_spniq_product category flag
+SPNIQ_CATEGORIES = {
+    "Graphics Card": "is_gpu",
+    "CPU": "is_cpu",
+    "Storage": "is_storage",
+    "Motherboard": "is_motherboard",
+    "Monitors": "is_monitor",
+    "PSU": "is_power_supply",
+    "Coolers": "is_cooler",
+    "Computer Cases": "is_case",
+}
+
+def get_spniq_categories(context: SiteCrawlContext) -> List[Dict]:
+    """Fetch the spniq /categories payload (every category with its products embedded)"""
     try:
-        # Get all categories first
         url = f"{BASE_URL_SPNIQ}/categories"
-        res = requests.get(url, headers=HEADERS)
+        res = context.get(url)
         if res.status_code != 200:
             print(f"Error fetching spniq categories: HTTP {res.status_code}")
             return []
@@ -1912,90 +1118,20 @@ def get_gpu_from_spniq() -> List[Dict]:
             print("spniq API returned unexpected format")
             return []
         
-        # Find the GPU category
-        gpu_category = None
-        for category in categories:
-            if category.get("title") == "Graphics Card":
-                gpu_category = category
-                break
-        
-        if not gpu_category:
-            print("No Graphics Card category found in spniq API")
-            return []
-        
-        # Process GPU products
-        products = gpu_category.get("products", [])
-        for item in products:
-            try:
-                product = parse_spniq_product(item, is_gpu=True)
-                if product:
-                    gpu_products.append(product)
-            except Exception as e:
-                continue
-        
-        time.sleep(0.3)
+        return categories
         
     except Exception as e:
-        print(f"Error fetching spniq graphics cards: {e}")
-    
-    return gpu_products
-
-def get_cpu_from_spniq() -> List[Dict]:
-    """Fetch CPUs from spniq API"""
-    return get_spniq_category_products("CPU", is_cpu=True)
-
-def get_storage_from_spniq() -> List[Dict]:
-    """Fetch Storage devices from spniq API"""
-    return get_spniq_category_products("Storage", is_storage=True)
-
-def get_motherboard_from_spniq() -> List[Dict]:
-    """Fetch Motherboards from spniq API"""
-    return get_spniq_category_products("Motherboard", is_motherboard=True)
-
-def get_monitor_from_spniq() -> List[Dict]:
-    """Fetch Monitors from spniq API"""
-    return get_spniq_category_products("Monitors", is_monitor=True)
-
-def get_psu_from_spniq() -> List[Dict]:
-    """Fetch Power Supplies from spniq API"""
-    return get_spniq_category_products("PSU", is_power_supply=True)
-
-def get_cooler_from_spniq() -> List[Dict]:
-    """Fetch Coolers from spniq API"""
-    return get_spniq_category_products("Coolers", is_cooler=True)
-
-def get_case_from_spniq() -> List[Dict]:
-    """Fetch Computer Cases from spniq API"""
-    return get_spniq_category_products("Computer Cases", is_case=True)
+        print(f"Error fetching spniq categories: {e}")
+        return []
 
 def get_laptop_from_globaliraq() -> List[Dict]:
     """Fetch Laptops from Global Iraq API"""
-    laptop_products = []
-    
     try:
-        url = "https://globaliraq.net/collections/laptop/products.json"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            print(f"Error fetching Global Iraq laptops: HTTP {res.status_code}")
-            return []
-        
-        data = res.json()
-        products = data.get("products", [])
-        
-        for item in products:
-            try:
-                product = parse_globaliraq_product(item, is_laptop=True)
-                if product:
-                    laptop_products.append(product)
-            except Exception as e:
-                print(f"Error parsing Global Iraq laptop product: {e}")
-                continue
-                
+        context = SiteCrawlContext("globaliraq", BASE_URL_GLOBAL)
+        return crawl_shopify_collection(context, "laptop", parse_globaliraq_product, is_laptop=True)
     except Exception as e:
         print(f"Error fetching Global Iraq laptops: {e}")
         return []
-    
-    return laptop_products
 
 def get_laptop_from_kolshzin() -> List[Dict]:
     """Fetch Laptops from Kolshzin"""
@@ -2004,12 +1140,12 @@ def get_laptop_from_kolshzin() -> List[Dict]:
     try:
         # Get first page
         url = "https://kolshzin.com/product-category/laptops/"
-        res = requests.get(url, headers=HEADERS)
+        res = fetch(url)
         if res.status_code != 200:
             print(f"Error fetching Kolshzin laptops: HTTP {res.status_code}")
             return []
         
-        soup = BeautifulSoup(res.content, 'html.parser')
+        soup = make_soup(res.content)
         
         # Extract products from current page
         products = extract_kolshzin_products_from_page(soup, is_laptop=True)
@@ -2027,18 +1163,22 @@ def get_laptop_from_kolshzin() -> List[Dict]:
                 except ValueError:
                     continue
             
-            # Fetch additional pages (limit to 5 pages)
-            for page in range(2, min(max_page + 1, 6)):
+            # The page count is known, so fetch every remaining page at once and
+            # parse each as it arrives; results are still added in page order
+            page_urls = {f"https://kolshzin.com/product-category/laptops/page/{page}/": page for page in range(2, max_page + 1)}
+            page_products = {}
+            for page_url, page_res in fetch_as_completed(list(page_urls)):
+                page = page_urls[page_url]
                 try:
-                    page_url = f"https://kolshzin.com/product-category/laptops/page/{page}/"
-                    page_res = requests.get(page_url, headers=HEADERS)
-                    if page_res.status_code == 200:
-                        page_soup = BeautifulSoup(page_res.content, 'html.parser')
-                        page_products = extract_kolshzin_products_from_page(page_soup, is_laptop=True)
-                        laptop_products.extend(page_products)
+                    if page_res is not None and page_res.status_code == 200:
+                        # Later pages only need their product list, not the pagination nav
+                        page_soup = make_soup(page_res.content, KOLSHZIN_LISTING)
+                        page_products[page] = extract_kolshzin_products_from_page(page_soup, is_laptop=True)
                 except Exception as e:
                     print(f"Error fetching Kolshzin laptops page {page}: {e}")
                     continue
+            for page in sorted(page_products):
+                laptop_products.extend(page_products[page])
                 
     except Exception as e:
         print(f"Error fetching Kolshzin laptops: {e}")
@@ -2048,78 +1188,22 @@ def get_laptop_from_kolshzin() -> List[Dict]:
 
 def get_laptop_from_3diraq() -> List[Dict]:
     """Fetch Laptops from 3D Iraq"""
-    laptop_products, _ = get_laptop_from_3diraq_with_links()
-    return laptop_products
-
-def get_laptop_from_3diraq_with_links() -> tuple[List[Dict], set]:
-    """Fetch Laptops from 3D Iraq with link tracking"""
-    laptop_products = []
-    laptop_links = set()
-    page = 1
-    
-    while True:
-        url = f"https://3d-iraq.com/laptop?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
+    context = SiteCrawlContext("3d-iraq", BASE_URL_3DIRAQ)
+    for product in crawl_3diraq_category(context, "laptop", is_laptop=True):
+        context.add(product, product["id"], product["link"])
+    return context.products
 
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    laptop_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_laptop=True)
-                laptop_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return laptop_products, laptop_links
+def get_spniq_category_products(context: SiteCrawlContext, category_name: str, categories: List[Dict] = None, **category_flags) -> List[Dict]:
+    """Generic function to fetch products from any spniq category, registering them into the context
 
-def get_spniq_category_products(category_name: str, **category_flags) -> List[Dict]:
-    """Generic function to fetch products from any spniq category"""
+    Pass the already fetched /categories payload to avoid downloading it again.
+    """
     products = []
     
+    if categories is None:
+        categories = get_spniq_categories(context)
+    
     try:
-        # Get all categories first
-        url = f"{BASE_URL_SPNIQ}/categories"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            print(f"Error fetching spniq categories: HTTP {res.status_code}")
-            return []
-        
-        categories = res.json()
-        if not isinstance(categories, list):
-            print("spniq API returned unexpected format")
-            return []
-        
         # Find the target category
         target_category = None
         for category in categories:
@@ -2137,7 +1221,7 @@ def get_spniq_category_products(category_name: str, **category_flags) -> List[Di
         for item in category_products:
             try:
                 product = parse_spniq_product(item, **category_flags)
-                if product:
+                if product and context.add(product):
                     products.append(product)
             except Exception as e:
                 print(f"Error parsing spniq {category_name} product: {e}")
@@ -2152,37 +1236,23 @@ def get_spniq_category_products(category_name: str, **category_flags) -> List[Di
 def get_products_from_spniq() -> List[Dict]:
     
     """Main function to get all products from spniq"""
-    products = []
+    context = SiteCrawlContext("spniq", BASE_URL_SPNIQ)
     
     print("ðŸ•¸ï¸ spniq: Starting...")
     
-    # Get products from all categories
-    gpu_products = get_gpu_from_spniq()
-    products.extend(gpu_products)
+    # Every category (and its products) comes in one /categories payload - fetch it once
+    categories = get_spniq_categories(context)
+    if not categories:
+        context.report()
+        return context.products
     
-    cpu_products = get_cpu_from_spniq()
-    products.extend(cpu_products)
+    # Get products from all categories
+    for category_name, category_flag in SPNIQ_CATEGORIES.items():
+        get_spniq_category_products(context, category_name, categories, **{category_flag: True})
     
-    storage_products = get_storage_from_spniq()
-    products.extend(storage_products)
-    
-    motherboard_products = get_motherboard_from_spniq()
-    products.extend(motherboard_products)
-    
-    monitor_products = get_monitor_from_spniq()
-    products.extend(monitor_products)
-    
-    psu_products = get_psu_from_spniq()
-    products.extend(psu_products)
-    
-    cooler_products = get_cooler_from_spniq()
-    products.extend(cooler_products)
-    
-    case_products = get_case_from_spniq()
-    products.extend(case_products)
-    
-    print(f"âœ… spniq: Completed - {len(products)} products")
-    return products
+    print(f"âœ… spniq: Completed - {len(context.products)} products")
+    context.report()
+    return context.products
 
 # -------------------- Galaxy IQ Parser --------------------
 def parse_galaxyiq_product(product_div, category: str) -> Dict:
@@ -2277,31 +1347,38 @@ def parse_galaxyiq_product(product_div, category: str) -> Dict:
 
 
 # -------------------- Galaxy IQ Scraper --------------------
-def get_products_from_galaxyiq() -> List[Dict]:
-    """Scrape products from Galaxy IQ"""
-    products = []
-    
-    print("🌌 Galaxy IQ: Starting...")
-    
-    # Category mappings: URL slug -> Our category name
-    categories = {
-        'graphics-cards-gpu': 'GPU',
-        'processors': 'CPU',
-        'ram': 'RAM',
-        'motherboards': 'Motherboards',
-        'storage': 'Storage',
-        'power-supply-psu': 'Power Supply',
-        'coolers': 'Cooler',
-        'computer-cases': 'Case',
-        'gaming-monitors': 'Monitors',
-        'laptop': 'Laptops',
-        'mouse-1': 'Mouse',
-        'keyboard': 'Keyboard',
-        'headsets': 'Headsets'
-    }
+# Solved Cloudflare challenge (clearance cookies + the user-agent they are bound to), reused across runs
+GALAXYIQ_CLEARANCE_FILE = Path(__file__).parent / ".galaxyiq_clearance.json"
+
+# Lifetime assumed for a clearance whose cookies carry no expiry of their own (seconds)
+GALAXYIQ_CLEARANCE_MAX_AGE = 30 * 60
+
+# Category mappings: URL slug -> Our category name
+GALAXYIQ_CATEGORIES = {
+    'graphics-cards-gpu': 'GPU',
+    'processors': 'CPU',
+    'ram': 'RAM',
+    'motherboards': 'Motherboards',
+    'storage': 'Storage',
+    'power-supply-psu': 'Power Supply',
+    'coolers': 'Cooler',
+    'computer-cases': 'Case',
+    'gaming-monitors': 'Monitors',
+    'laptop': 'Laptops',
+    'mouse-1': 'Mouse',
+    'keyboard': 'Keyboard',
+    'headsets': 'Headsets'
+}
+
+def solve_galaxyiq_clearance():
+    """Solve the Cloudflare challenge with cloudscraper and persist the clearance; None on failure"""
+    try:
+        # Only needed when there is no usable clearance on disk
+        import cloudscraper
+    except ImportError:
+        print("⚠️ cloudscraper is not installed, cannot solve the Galaxy IQ challenge")
+        return None
     
-    # Use cloudscraper to bypass Cloudflare protection
-    import cloudscraper
     session = cloudscraper.create_scraper(
         browser={
             'browser': 'chrome',
@@ -2309,91 +1386,111 @@ def get_products_from_galaxyiq() -> List[Dict]:
             'desktop': True
         }
     )
+    try:
+        response = fetch_external(BASE_URL_GALAXYIQ, lambda: session.get(BASE_URL_GALAXYIQ, timeout=30))
+    except Exception as e:
+        print(f"⚠️ Galaxy IQ challenge failed: {e}")
+        return None
+    if response.status_code != 200:
+        print(f"⚠️ Galaxy IQ challenge failed: HTTP {response.status_code}")
+        return None
     
-    for category_slug, category_name in categories.items():
-        page = 1
-        consecutive_failures = 0
-        max_consecutive_failures = 3
-        
-        while consecutive_failures < max_consecutive_failures:
-            try:
-                url = f"{BASE_URL_GALAXYIQ}/product-categories/{category_slug}?page={page}"
-                print(f"  ðŸ“„ Fetching {category_name} page {page}...")
-                
-                response = session.get(url, timeout=30)
-                
-                if response.status_code != 200:
-                    print(f"  âš ï¸ Status {response.status_code} for {category_name} page {page}")
-                    consecutive_failures += 1
-                    break
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find all products
-                product_divs = soup.find_all('div', class_='product')
-                
-                if not product_divs:
-                    print(f"  âœ… {category_name}: No more products on page {page}")
-                    break
-                
-                page_product_count = 0
-                for product_div in product_divs:
-                    product = parse_galaxyiq_product(product_div, category_name)
-                    if product:
-                        products.append(product)
-                        page_product_count += 1
-                
-                print(f"  âœ… {category_name} page {page}: Found {page_product_count} products")
-                
-                if page_product_count == 0:
-                    consecutive_failures += 1
-                else:
-                    consecutive_failures = 0
-                
-                page += 1
-                time.sleep(0.5)  # Be polite
-                
-            except Exception as e:
-                print(f"  âš ï¸ Error fetching {category_name} page {page}: {e}")
-                consecutive_failures += 1
-                time.sleep(1)
+    cookies = {cookie.name: cookie.value for cookie in session.cookies}
+    expiries = [cookie.expires for cookie in session.cookies if cookie.expires]
+    clearance = {
+        "user_agent": session.headers.get("User-Agent", HEADERS["User-Agent"]),
+        "cookies": cookies,
+        "expires": min(expiries) if expiries else time.time() + GALAXYIQ_CLEARANCE_MAX_AGE,
+    }
     
-    print(f"ðŸŒŒ Galaxy IQ: Completed - {len(products)} products")
-    return products
+    # Nothing worth keeping when the site answered without setting any cookie
+    if cookies:
+        try:
+            with open(GALAXYIQ_CLEARANCE_FILE, "w", encoding="utf-8") as f:
+                json.dump(clearance, f)
+        except OSError as e:
+            print(f"⚠️ Could not save Galaxy IQ clearance: {e}")
+    return clearance
+
+def get_galaxyiq_clearance(refresh: bool = False):
+    """Galaxy IQ Cloudflare clearance, read from disk while it is still valid, else solved anew"""
+    if not refresh:
+        try:
+            with open(GALAXYIQ_CLEARANCE_FILE, "r", encoding="utf-8") as f:
+                clearance = json.load(f)
+            if clearance.get("expires", 0) > time.time() + 60:
+                return clearance
+        except (OSError, ValueError):
+            pass
+    return solve_galaxyiq_clearance()
+
+def get_galaxyiq_headers(clearance) -> Dict[str, str]:
+    """Request headers that present the clearance cookies with the user-agent they were issued to"""
+    if not clearance:
+        return {}
+    headers = {"User-Agent": clearance["user_agent"]}
+    if clearance["cookies"]:
+        headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in clearance["cookies"].items())
+    return headers
+
+# The part of a Galaxy IQ category page that is parsed: its product divs
+GALAXYIQ_GRID = class_strainer("product", "div")
+
+def get_galaxyiq_product_divs(res) -> list:
+    """Product divs of one Galaxy IQ category page (empty list ends pagination)"""
+    if res.status_code != 200:
+        return []
+    soup = make_soup(res.text, GALAXYIQ_GRID)
+    return soup.find_all('div', class_='product')
 
+def crawl_galaxyiq_category(context: SiteCrawlContext, category_slug: str, headers: Dict[str, str]) -> List[Dict]:
+    """Walk every page of one Galaxy IQ category and return its products in page order (not registered)"""
+    category_name = GALAXYIQ_CATEGORIES[category_slug]
+    products = []
+    
+    def get_product_divs(res) -> list:
+        # A Cloudflare challenge mid-walk is not the category's last page
+        if res.status_code in (403, 503):
+            context.mark_partial(f"⚠️ galaxyiq: {category_name} blocked by Cloudflare (HTTP {res.status_code}), returning partial results")
+            return []
+        return get_galaxyiq_product_divs(res)
+    
+    for product_divs in context.paginate(lambda page: f"{BASE_URL_GALAXYIQ}/product-categories/{category_slug}?page={page}", get_product_divs, headers=headers):
+        for product_div in product_divs:
+            product = parse_galaxyiq_product(product_div, category_name)
+            if product:
+                products.append(product)
+    
+    print(f"  ✅ {category_name}: {len(products)} products")
+    return products
 
-def get_laptop_products() -> List[Dict]:
-    """Get all laptop products from all sources"""
-    all_laptops = []
+def get_products_from_galaxyiq() -> List[Dict]:
+    """Scrape products from Galaxy IQ"""
+    context = SiteCrawlContext("galaxyiq", BASE_URL_GALAXYIQ)
     
-    print("ðŸ•¸ï¸ Laptops: Starting...")
+    print("🌌 Galaxy IQ: Starting...")
     
-    # Global Iraq laptops
-    try:
-        globaliraq_laptops = get_laptop_from_globaliraq()
-        all_laptops.extend(globaliraq_laptops)
-        print(f"âœ… Global Iraq: {len(globaliraq_laptops)} laptops")
-    except Exception as e:
-        print(f"âŒ Global Iraq laptops failed: {e}")
+    # Cloudflare protection: present a stored clearance, and solve a new one
+    # only when there is none or the site no longer accepts it
+    clearance = get_galaxyiq_clearance()
+    headers = get_galaxyiq_headers(clearance)
+    probe = context.get(BASE_URL_GALAXYIQ, headers=headers)
+    if probe.status_code in (403, 503):
+        clearance = get_galaxyiq_clearance(refresh=True)
+        headers = get_galaxyiq_headers(clearance)
     
-    # Kolshzin laptops
-    try:
-        kolshzin_laptops = get_laptop_from_kolshzin()
-        all_laptops.extend(kolshzin_laptops)
-        print(f"âœ… Kolshzin: {len(kolshzin_laptops)} laptops")
-    except Exception as e:
-        print(f"âŒ Kolshzin laptops failed: {e}")
+    # All categories at once over the one cleared session
+    category_products = context.run_concurrently(lambda category_slug: crawl_galaxyiq_category(context, category_slug, headers), GALAXYIQ_CATEGORIES)
     
-    # 3D Iraq laptops  
-    try:
-        diraq_laptops = get_laptop_from_3diraq()
-        all_laptops.extend(diraq_laptops)
-        print(f"âœ… 3D Iraq: {len(diraq_laptops)} laptops")
-    except Exception as e:
-        print(f"âŒ 3D Iraq laptops failed: {e}")
+    # Register in GALAXYIQ_CATEGORIES order, so a product listed in several
+    # categories gets the first one's regardless of which crawl finished first
+    for products in category_products:
+        for product in products or []:
+            context.add(product)
     
-    print(f"âœ… Laptops: Completed - {len(all_laptops)} products")
-    return all_laptops
+    print(f"ðŸŒŒ Galaxy IQ: Completed - {len(context.products)} products")
+    context.report()
+    return context.products
 
 # -------------------- 3D-Iraq Parser --------------------
 
@@ -2527,847 +1624,247 @@ def parse_altajit_product(product_data: dict, is_gpu: bool = False, is_laptop: b
     """Parse altajit product data from Shopify JSON API"""
     
     # Get basic product info
-    title = product_data.get('title', 'Unknown')
-    product_id = str(product_data.get('id', ''))
-    handle = product_data.get('handle', '')
-    vendor = product_data.get('vendor', '')
-    
-    # Get variants (Shopify products have variants with pricing)
-    variants = product_data.get('variants', [])
-    if not variants:
-            return None
-    
-    # Use first variant for pricing (most products have one variant)
-    variant = variants[0]
-    
-    price = float(variant.get('price', 0))
-    compare_price = variant.get('compare_at_price')
-    available = variant.get('available', True)
-    
-    # Calculate discount
-    old_price = None
-    discount_percent = 0
-    if compare_price and float(compare_price) > price:
-        old_price = float(compare_price)
-        discount_percent = calculate_discount(old_price, price)
-    
-    # Get image - try featured_image first, then images array
-    image_url = ""
-    featured_image = product_data.get('featured_image')
-    
-    if featured_image:
-        image_url = featured_image if featured_image.startswith('http') else f"https:{featured_image}"
-    else:
-        # No featured_image, try first image from images array
-        images = product_data.get('images', [])
-        if images:
-            first_image = images[0]
-            if isinstance(first_image, dict):
-                image_src = first_image.get('src', '')
-                if image_src:
-                    image_url = image_src
-            elif isinstance(first_image, str):
-                # Maybe it's just a string URL
-                image_url = first_image
-    
-    # Build product data
-    parsed_product = {
-        "id": f"altajit-{product_id}",
-        "title": title,
-        "price": int(price),
-        "old_price": int(old_price) if old_price else None,
-        "raw_price": f"{int(price)}",
-        "raw_old_price": f"{int(old_price)}" if old_price else None,
-        "detected_currency": "IQD",
-        "discount": discount_percent,
-        "store": "Altajit",
-        "link": f"{BASE_URL_ALTAJIT}/products/{handle}",
-        "image": image_url,
-        "in_stock": available
-    }
-    
-    # Add category
-    if is_gpu:
-        parsed_product["category"] = "GPU"
-    elif is_laptop or is_gaming_laptop:
-        parsed_product["category"] = "Laptop"
-    elif is_desktop:
-        parsed_product["category"] = "Desktop"
-    elif is_all_in_one:
-        parsed_product["category"] = "All In One"
-    elif is_monitor:
-        parsed_product["category"] = "Monitor"
-    elif is_ram:
-        parsed_product["category"] = "RAM"
-    elif is_cooler:
-        parsed_product["category"] = "Cooler"
-    elif is_case:
-        parsed_product["category"] = "Case"
-    elif is_motherboard:
-        parsed_product["category"] = "Motherboards"
-    elif is_power_supply:
-        parsed_product["category"] = "Power Supply"
-    elif is_storage:
-        parsed_product["category"] = "Storage"
-    elif is_cpu:
-        parsed_product["category"] = "CPU"
-    elif is_keyboard:
-        parsed_product["category"] = "Keyboard"
-    elif is_mouse:
-        parsed_product["category"] = "Mouse"
-    elif is_headset:
-        parsed_product["category"] = "Headset"
-    
-    return parsed_product
-
-# -------------------- 3D-Iraq Scraper --------------------
-def get_gpus_from_3diraq() -> tuple[List[Dict], set]:
-    gpus = []
-    gpu_links = set()
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_3DIRAQ}/collections/graphics-cards?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    gpu_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_gpu=True)
-                gpus.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return gpus, gpu_links
-
-def get_ram_from_3diraq() -> tuple[List[Dict], set]:
-    ram_products = []
-    ram_links = set()
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_3DIRAQ}/pc-part/ram?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    ram_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_ram=True)
-                ram_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return ram_products, ram_links
-
-def get_cpus_from_3diraq() -> tuple[List[Dict], set]:
-    cpu_products = []
-    cpu_links = set()
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_3DIRAQ}/pc-part/cpu?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    cpu_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_cpu=True)
-                cpu_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return cpu_products, cpu_links
-
-def get_motherboards_from_3diraq() -> tuple[List[Dict], set]:
-    motherboard_products = []
-    motherboard_links = set()
-    page = 1
-    
-    while True:
-        url = f"{BASE_URL_3DIRAQ}/pc-part/motherboards?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    motherboard_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_motherboard=True)
-                motherboard_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return motherboard_products, motherboard_links
-
-def get_mice_from_3diraq() -> tuple[List[Dict], set]:
-    """Fetch Mice directly from 3D-Iraq's mouse collection"""
-    mouse_products = []
-    mouse_links = set()
-    page = 1
-    
-    while True:
-        url = f"https://3d-iraq.com/pc-accessories/mouse?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    mouse_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_mouse=True)
-                mouse_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return mouse_products, mouse_links
-
-def get_keyboards_from_3diraq() -> tuple[List[Dict], set]:
-    """Fetch Keyboards directly from 3D-Iraq's keyboard collection"""
-    keyboard_products = []
-    keyboard_links = set()
-    page = 1
-    
-    while True:
-        url = f"https://3d-iraq.com/pc-accessories/keybord?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    keyboard_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_keyboard=True)
-                keyboard_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return keyboard_products, keyboard_links
-
-def get_power_supply_from_3diraq() -> tuple[List[Dict], set]:
-    """Fetch Power Supply directly from 3D-Iraq's power supply collection"""
-    power_supply_products = []
-    power_supply_links = set()
-    page = 1
-    
-    while True:
-        url = f"https://3d-iraq.com/pc-part/power-supply?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    power_supply_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_power_supply=True)
-                power_supply_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
+    title = product_data.get('title', 'Unknown')
+    product_id = str(product_data.get('id', ''))
+    handle = product_data.get('handle', '')
+    vendor = product_data.get('vendor', '')
     
-    return power_supply_products, power_supply_links
-
-def get_cases_from_3diraq() -> tuple[List[Dict], set]:
-    """Fetch Cases directly from 3D-Iraq's case collection"""
-    case_products = []
-    case_links = set()
-    page = 1
+    # Get variants (Shopify products have variants with pricing)
+    variants = product_data.get('variants', [])
+    if not variants:
+            return None
     
-    while True:
-        url = f"https://3d-iraq.com/pc-part/case?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    case_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_case=True)
-                case_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
+    # Use first variant for pricing (most products have one variant)
+    variant = variants[0]
     
-    return case_products, case_links
-
-def get_storage_from_3diraq() -> tuple[List[Dict], set]:
-    """Fetch Storage directly from 3D-Iraq's storage collection"""
-    storage_products = []
-    storage_links = set()
-    page = 1
+    price = float(variant.get('price', 0))
+    compare_price = variant.get('compare_at_price')
+    available = variant.get('available', True)
     
-    while True:
-        url = f"https://3d-iraq.com/pc-part/storge?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    storage_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_storage=True)
-                storage_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
+    # Calculate discount
+    old_price = None
+    discount_percent = 0
+    if compare_price and float(compare_price) > price:
+        old_price = float(compare_price)
+        discount_percent = calculate_discount(old_price, price)
     
-    return storage_products, storage_links
-
-def get_coolers_from_3diraq() -> tuple[List[Dict], set]:
-    """Fetch Coolers directly from 3D-Iraq's cooler collection"""
-    cooler_products = []
-    cooler_links = set()
-    page = 1
+    # Get image - try featured_image first, then images array
+    image_url = ""
+    featured_image = product_data.get('featured_image')
     
-    while True:
-        url = f"https://3d-iraq.com/pc-part/coolers-62?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    cooler_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_cooler=True)
-                cooler_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
+    if featured_image:
+        image_url = featured_image if featured_image.startswith('http') else f"https:{featured_image}"
+    else:
+        # No featured_image, try first image from images array
+        images = product_data.get('images', [])
+        if images:
+            first_image = images[0]
+            if isinstance(first_image, dict):
+                image_src = first_image.get('src', '')
+                if image_src:
+                    image_url = image_src
+            elif isinstance(first_image, str):
+                # Maybe it's just a string URL
+                image_url = first_image
     
-    return cooler_products, cooler_links
-
-def get_monitors_from_3diraq() -> tuple[List[Dict], set]:
-    """Fetch Monitors directly from 3D-Iraq's monitor collection"""
-    monitor_products = []
-    monitor_links = set()
-    page = 1
+    # Build product data
+    parsed_product = {
+        "id": f"altajit-{product_id}",
+        "title": title,
+        "price": int(price),
+        "old_price": int(old_price) if old_price else None,
+        "raw_price": f"{int(price)}",
+        "raw_old_price": f"{int(old_price)}" if old_price else None,
+        "detected_currency": "IQD",
+        "discount": discount_percent,
+        "store": "Altajit",
+        "link": f"{BASE_URL_ALTAJIT}/products/{handle}",
+        "image": image_url,
+        "in_stock": available
+    }
     
-    while True:
-        url = f"https://3d-iraq.com/monitor?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
-        for p in items:
-            try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
+    # Add category
+    if is_gpu:
+        parsed_product["category"] = "GPU"
+    elif is_laptop or is_gaming_laptop:
+        parsed_product["category"] = "Laptop"
+    elif is_desktop:
+        parsed_product["category"] = "Desktop"
+    elif is_all_in_one:
+        parsed_product["category"] = "All In One"
+    elif is_monitor:
+        parsed_product["category"] = "Monitor"
+    elif is_ram:
+        parsed_product["category"] = "RAM"
+    elif is_cooler:
+        parsed_product["category"] = "Cooler"
+    elif is_case:
+        parsed_product["category"] = "Case"
+    elif is_motherboard:
+        parsed_product["category"] = "Motherboards"
+    elif is_power_supply:
+        parsed_product["category"] = "Power Supply"
+    elif is_storage:
+        parsed_product["category"] = "Storage"
+    elif is_cpu:
+        parsed_product["category"] = "CPU"
+    elif is_keyboard:
+        parsed_product["category"] = "Keyboard"
+    elif is_mouse:
+        parsed_product["category"] = "Mouse"
+    elif is_headset:
+        parsed_product["category"] = "Headset"
+    
+    return parsed_product
 
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
+# -------------------- 3D-Iraq Scraper --------------------
+# The part of a 3D-Iraq listing page that is parsed: its product cards
+DIRAQ_GRID = class_strainer("product-card")
+
+# Selectors of a 3D-Iraq listing page and its product cards
+DIRAQ_SELECTORS = compile_selectors({
+    "card": ".card.product-card",
+    "title": "h3.product-title a",
+    "price": ".product-price .text-primary",
+    "old_price": ".product-price del",
+    "image": "img",
+})
+
+def get_3diraq_product_cards(res) -> list:
+    """Product cards of one 3D-Iraq listing page (empty list ends pagination)"""
+    if res.status_code != 200:
+        return []
+    return DIRAQ_SELECTORS["card"].select(make_soup(res.text, DIRAQ_GRID))
+
+def parse_3diraq_card(p, **category_flags) -> Dict:
+    """Parse one .card.product-card element of a 3D-Iraq listing page"""
+    # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
+    # To avoid making extra requests for each product, we set all as in_stock=True
+    in_stock = True
+    
+    title_el = DIRAQ_SELECTORS["title"].select_one(p)
+    new_price_el = DIRAQ_SELECTORS["price"].select_one(p)
+    old_price_el = DIRAQ_SELECTORS["old_price"].select_one(p)
+
+    title = title_el.text.strip() if title_el else "Unknown"
+    new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
+    old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
+
+    img_el = DIRAQ_SELECTORS["image"].select_one(p)
+    img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
+    if img_src and not img_src.startswith("http"):
+        img_src = BASE_URL_3DIRAQ + img_src
+
+    link = title_el["href"] if title_el else ""
+    
+    return parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, **category_flags)
+
+# Listing path -> parse_3diraq_product category flag, in priority order
+DIRAQ_CATEGORIES = {
+    "collections/graphics-cards": "is_gpu",
+    "pc-part/ram": "is_ram",
+    "pc-part/cpu": "is_cpu",
+    "pc-part/motherboards": "is_motherboard",
+    "pc-accessories/mouse": "is_mouse",
+    "pc-accessories/keybord": "is_keyboard",
+    "pc-part/power-supply": "is_power_supply",
+    "pc-part/case": "is_case",
+    "pc-part/storge": "is_storage",
+    "pc-part/coolers-62": "is_cooler",
+    "monitor": "is_monitor",
+    "pc-accessories/headset": "is_headset",
+    "laptop": "is_laptop",
+}
 
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    monitor_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_monitor=True)
-                monitor_products.append(product)
-                    
-            except Exception as e:
-                continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    return monitor_products, monitor_links
+def crawl_3diraq_category(context: SiteCrawlContext, path: str, **category_flags) -> List[Dict]:
+    """Walk every page of one 3D-Iraq listing and return its products in page order
 
-def get_headsets_from_3diraq() -> tuple[List[Dict], set]:
-    """Fetch Headsets directly from 3D-Iraq's headset collection"""
-    headset_products = []
-    headset_links = set()
-    page = 1
+    Nothing is registered here, so listings can be crawled side by side and
+    registered afterwards in a fixed order.
+    """
+    products = []
     
-    while True:
-        url = f"https://3d-iraq.com/pc-accessories/headset?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
+    for items in context.paginate(lambda page: f"{BASE_URL_3DIRAQ}/{path}?page={page}", get_3diraq_product_cards):
         for p in items:
             try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                link = title_el["href"] if title_el else ""
-                
-                if link:
-                    headset_links.add(link)
-                
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock, is_headset=True)
-                headset_products.append(product)
-                    
+                products.append(parse_3diraq_card(p, **category_flags))
             except Exception as e:
                 continue
-        
-        page += 1
-        time.sleep(0.3)
     
-    return headset_products, headset_links
+    return products
 
 def get_products_from_3diraq() -> List[Dict]:
-    products = []
+    context = SiteCrawlContext("3d-iraq", BASE_URL_3DIRAQ)
     
     print("ðŸ–¥ï¸ 3D-Iraq: Starting...")
     
-    gpu_products, gpu_links = get_gpus_from_3diraq()
-    products.extend(gpu_products)
-    
-    ram_products, ram_links = get_ram_from_3diraq()
-    products.extend(ram_products)
-    
-    cpu_products, cpu_links = get_cpus_from_3diraq()
-    products.extend(cpu_products)
-    
-    motherboard_products, motherboard_links = get_motherboards_from_3diraq()
-    products.extend(motherboard_products)
-    
-    mouse_products, mouse_links = get_mice_from_3diraq()
-    products.extend(mouse_products)
-    
-    keyboard_products, keyboard_links = get_keyboards_from_3diraq()
-    products.extend(keyboard_products)
-    
-    power_supply_products, power_supply_links = get_power_supply_from_3diraq()
-    products.extend(power_supply_products)
-    
-    case_products, case_links = get_cases_from_3diraq()
-    products.extend(case_products)
-    
-    storage_products, storage_links = get_storage_from_3diraq()
-    products.extend(storage_products)
-    
-    cooler_products, cooler_links = get_coolers_from_3diraq()
-    products.extend(cooler_products)
-    
-    monitor_products, monitor_links = get_monitors_from_3diraq()
-    products.extend(monitor_products)
-    
-    headset_products, headset_links = get_headsets_from_3diraq()
-    products.extend(headset_products)
-    
-    # Get laptops
-    laptop_products, laptop_links = get_laptop_from_3diraq_with_links()
-    products.extend(laptop_products)
-    
-    # Get other products from general collection
-    # Track links from specific collections to avoid duplicates
-    all_excluded_links = gpu_links | ram_links | cpu_links | motherboard_links | mouse_links | keyboard_links | power_supply_links | case_links | storage_links | cooler_links | monitor_links | headset_links | laptop_links
-    
-    page = 1
-    while True:
-        url = f"{BASE_URL_3DIRAQ}/products?page={page}"
-        res = requests.get(url, headers=HEADERS)
-        if res.status_code != 200:
-            break
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".card.product-card")
-        if not items:
-            break
-        
+    # Product link -> category flag. When the cached map is missing or stale, crawl every
+    # category listing at once (sharing the host's rate limit) and rebuild the map from them
+    membership = load_category_membership("3d-iraq")
+    if membership is None:
+        membership = {}
+        category_products = context.run_concurrently(
+            lambda category: crawl_3diraq_category(context, category[0], **{category[1]: True}),
+            list(DIRAQ_CATEGORIES.items())
+        )
+        
+        # Register in table order, so a product listed in several categories
+        # keeps the first one's category whatever order the crawls finished in
+        for (path, category_flag), products in zip(DIRAQ_CATEGORIES.items(), category_products):
+            for product in products or []:
+                if product["link"]:
+                    membership.setdefault(product["link"], category_flag)
+                context.add(product, product["id"], product["link"])
+        
+        # A map built from failed or cut-short crawls would mis-tag the sweep for a whole day
+        if None not in category_products and not context.partial:
+            save_category_membership("3d-iraq", membership)
+    
+    # Sweep the full catalog last; cards whose link is already registered are
+    # skipped before being parsed, the rest are tagged from the membership map
+    for items in context.paginate(lambda page: f"{BASE_URL_3DIRAQ}/products?page={page}", get_3diraq_product_cards):
         for p in items:
             try:
-                # Note: 3d-iraq doesn't show stock status on listing pages, only on individual product pages
-                # To avoid making extra requests for each product, we set all as in_stock=True
-                in_stock = True
-                
-                title_el = p.select_one("h3.product-title a")
+                title_el = DIRAQ_SELECTORS["title"].select_one(p)
                 link = title_el["href"] if title_el else ""
-                
-                # Skip if this product is already in our specialized collections
-                if link in gpu_links or link in ram_links or link in cpu_links or link in motherboard_links or link in mouse_links or link in keyboard_links:
+                if context.seen(link):
                     continue
                 
-                new_price_el = p.select_one(".product-price .text-primary")
-                old_price_el = p.select_one(".product-price del")
-
-                title = title_el.text.strip() if title_el else "Unknown"
-                new_price_text = new_price_el.text if new_price_el and new_price_el.text else "0"
-                old_price_text = old_price_el.text if old_price_el and old_price_el.text else None
-
-                img_el = p.select_one("img")
-                img_src = img_el.get("data-src") or img_el.get("src") if img_el else ""
-                if img_src and not img_src.startswith("http"):
-                    img_src = BASE_URL_3DIRAQ + img_src
-
-                # Skip if this product link is already in our specialized collections
-                if link and link in all_excluded_links:
-                    continue
-
-                product = parse_3diraq_product(title, new_price_text, old_price_text, img_src, link, in_stock)
-                products.append(product)
+                category_flag = membership.get(link)
+                product = parse_3diraq_card(p, **({category_flag: True} if category_flag else {}))
+                context.add(product, product["id"], product["link"])
                     
             except Exception as e:
                 continue
-        
-        page += 1
-        time.sleep(0.3)
-    
-    # Remove duplicates based on product ID
-    seen_ids = set()
-    unique_products = []
     
-    for product in products:
-        product_id = product.get('id')
-        if product_id not in seen_ids:
-            seen_ids.add(product_id)
-            unique_products.append(product)
-    
-    return unique_products
+    context.report()
+    return context.products
 
 # -------------------- Almanjam Scraper --------------------
-def scrape_almanjam_category(category_type: str, **category_flags) -> List[Dict]:
-    """Generic function to scrape almanjam category"""
+def scrape_almanjam_category(category_type: str, crawl_context: SiteCrawlContext = None, **category_flags) -> List[Dict]:
+    """Generic function to scrape almanjam category (fetching through crawl_context when given)
+
+    Paging stops at the first page that brings no product ID this type has not
+    already yielded, since Almanjam keeps serving results past the last page.
+    """
     products = []
     page = 1
     max_pages = 20
+    seen_product_ids = set()
     
     while page <= max_pages:
         url = f"{BASE_URL_ALMANJAM}/ar/search?tag0=type:{category_type}&&from=&page={page}"
         
         try:
-            res = requests.get(url, headers=HEADERS, timeout=15)
+            res = crawl_context.get(url, timeout=15) if crawl_context else fetch(url, timeout=15)
             if res.status_code != 200:
+                # A page failing after retries is not the end of the listing
+                if crawl_context and (res.status_code >= 500 or res.status_code == 429):
+                    crawl_context.mark_partial(f"⚠️ almanjam: {category_type} page {page} failed with HTTP {res.status_code}, returning partial results")
                 break
             
-            soup = BeautifulSoup(res.content, 'html.parser')
+            # Products are embedded as JSON in the page's scripts; nothing else is parsed
+            soup = make_soup(res.content, SoupStrainer("script"))
             scripts = soup.find_all('script')
             
             products_found = False
@@ -3468,6 +1965,9 @@ def scrape_almanjam_category(category_type: str, **category_flags) -> List[Dict]
                         
                         for match in unique_matches:
                             prod_id, name_ar, name_en, price, stock = match.groups()
+                            if prod_id in seen_product_ids:
+                                continue
+                            seen_product_ids.add(prod_id)
                             new_products_count += 1
                             
                             # Extract image URL, discount info, and variant info
@@ -3527,11 +2027,10 @@ def scrape_almanjam_category(category_type: str, **category_flags) -> List[Dict]
                         
                         break
             
-            if not products_found or (new_products_count == 0 and page >= 2):
+            if not products_found or new_products_count == 0:
                 break
             
             page += 1
-            time.sleep(0.5)
             
         except Exception as e:
             print(f"Error scraping almanjam {category_type}: {e}")
@@ -3539,179 +2038,110 @@ def scrape_almanjam_category(category_type: str, **category_flags) -> List[Dict]
     
     return products
 
+# Almanjam search type -> (parse_almanjam_product category flag, label for the progress log)
+ALMANJAM_CATEGORIES = {
+    "gpu": ("is_gpu", "GPUs"),
+    "mb": ("is_motherboard", "Motherboards"),
+    "cpu": ("is_cpu", "CPUs"),
+    "ram": ("is_ram", "RAM"),
+    "keyboard": ("is_keyboard", "Keyboards"),
+    "headset": ("is_headset", "Headsets"),
+    "case": ("is_case", "Cases"),
+    "psu": ("is_power_supply", "Power Supplies"),
+    "cooler": ("is_cooler", "Coolers"),
+    "storage": ("is_storage", "Storage"),
+    "mouse": ("is_mouse", "Mice"),
+}
+
 def get_products_from_almanjam() -> List[Dict]:
     """Scrape all categories from almanjam"""
-    all_products = []
+    context = SiteCrawlContext("almanjam", BASE_URL_ALMANJAM)
     
     print("ðŸ›’ Almanjam: Starting...")
     
-    # GPU
-    gpu_products = scrape_almanjam_category("gpu", is_gpu=True)
-    all_products.extend(gpu_products)
-    print(f"  GPUs: {len(gpu_products)}")
-    
-    # Motherboards
-    mb_products = scrape_almanjam_category("mb", is_motherboard=True)
-    all_products.extend(mb_products)
-    print(f"  Motherboards: {len(mb_products)}")
-    
-    # CPU
-    cpu_products = scrape_almanjam_category("cpu", is_cpu=True)
-    all_products.extend(cpu_products)
-    print(f"  CPUs: {len(cpu_products)}")
-    
-    # RAM
-    ram_products = scrape_almanjam_category("ram", is_ram=True)
-    all_products.extend(ram_products)
-    print(f"  RAM: {len(ram_products)}")
-    
-    # Keyboards
-    keyboard_products = scrape_almanjam_category("keyboard", is_keyboard=True)
-    all_products.extend(keyboard_products)
-    print(f"  Keyboards: {len(keyboard_products)}")
-    
-    # Headsets
-    headset_products = scrape_almanjam_category("headset", is_headset=True)
-    all_products.extend(headset_products)
-    print(f"  Headsets: {len(headset_products)}")
-    
-    # Cases
-    case_products = scrape_almanjam_category("case", is_case=True)
-    all_products.extend(case_products)
-    print(f"  Cases: {len(case_products)}")
-    
-    # Power Supplies (PSU)
-    psu_products = scrape_almanjam_category("psu", is_power_supply=True)
-    all_products.extend(psu_products)
-    print(f"  Power Supplies: {len(psu_products)}")
-    
-    # Coolers
-    cooler_products = scrape_almanjam_category("cooler", is_cooler=True)
-    all_products.extend(cooler_products)
-    print(f"  Coolers: {len(cooler_products)}")
-    
-    # Storage
-    storage_products = scrape_almanjam_category("storage", is_storage=True)
-    all_products.extend(storage_products)
-    print(f"  Storage: {len(storage_products)}")
-    
-    # Mouse
-    mouse_products = scrape_almanjam_category("mouse", is_mouse=True)
-    all_products.extend(mouse_products)
-    print(f"  Mice: {len(mouse_products)}")
-    
-    print(f"Almanjam scraped: {len(all_products)} products")
-    return all_products
-
-# -------------------- Altajit Scraper (Shopify JSON API) --------------------
-def scrape_altajit_collection(collection_handle: str, **category_flags) -> List[Dict]:
-    """Scrape a collection from altajit using Shopify JSON API"""
-    products = []
+    # All types at once; the engine's limiter for the Almanjam host paces the requests
+    category_products = context.run_concurrently(
+        lambda category: scrape_almanjam_category(category[0], context, **{category[1][0]: True}),
+        list(ALMANJAM_CATEGORIES.items())
+    )
     
-    url = f"{BASE_URL_ALTAJIT}/collections/{collection_handle}/products.json"
+    # Register in table order so the result does not depend on which type finished first
+    for (category_type, (category_flag, label)), products in zip(ALMANJAM_CATEGORIES.items(), category_products):
+        added = sum(context.add(product) for product in products or [])
+        print(f"  {label}: {added}")
     
+    print(f"Almanjam scraped: {len(context.products)} products")
+    context.report()
+    return context.products
+
+# -------------------- Altajit Scraper (Shopify JSON API) --------------------
+# Collection handle -> parse_altajit_product category flag
+ALTAJIT_COLLECTIONS = {
+    "video-graphic-cards": "is_gpu",
+    "laptops": "is_laptop",
+    "gaming-laptop": "is_gaming_laptop",
+    "monitor": "is_monitor",
+    "gaming-monitor": "is_monitor",
+    "memory-ram": "is_ram",
+    "fans-cooling": "is_cooler",
+    "computer-cases": "is_case",
+    "motherboards": "is_motherboard",
+    "power-supplies": "is_power_supply",
+    "internal-hard-drives": "is_storage",
+    "external-hddssd": "is_storage",
+    "cpus-processors": "is_cpu",
+    "keyboards": "is_keyboard",
+    "mouse": "is_mouse",
+    "headphones": "is_headset",
+}
+
+def scrape_altajit_collection(context: SiteCrawlContext, collection_handle: str, **category_flags) -> List[Dict]:
+    """Scrape every page of a collection from altajit using Shopify JSON API (not registered into the context)"""
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        if response.status_code != 200:
-            print(f"Failed to fetch {collection_handle}: HTTP {response.status_code}")
-            return products
-        
-        data = response.json()
-        product_list = data.get('products', [])
-        
-        for product_data in product_list:
-            parsed_product = parse_altajit_product(product_data, **category_flags)
-            if parsed_product:
-                products.append(parsed_product)
-        
-        return products
-        
+        return crawl_shopify_collection(context, collection_handle, parse_altajit_product, register=False, **category_flags)
     except Exception as e:
         print(f"Error scraping altajit collection {collection_handle}: {e}")
-        return products
+        return []
 
 def get_products_from_altajit() -> List[Dict]:
     """Scrape all categories from altajit"""
-    all_products = []
-    
-    
-    # GPU/Graphics Cards
-    gpu_products = scrape_altajit_collection("video-graphic-cards", is_gpu=True)
-    all_products.extend(gpu_products)
-    
-    # Laptops (regular)
-    laptop_products = scrape_altajit_collection("laptops", is_laptop=True)
-    all_products.extend(laptop_products)
-    
-    # Gaming Laptops
-    gaming_laptop_products = scrape_altajit_collection("gaming-laptop", is_gaming_laptop=True)
-    all_products.extend(gaming_laptop_products)
-    
-    # Monitors (regular + gaming)
-    monitor_products = scrape_altajit_collection("monitor", is_monitor=True)
-    all_products.extend(monitor_products)
-    
-    gaming_monitor_products = scrape_altajit_collection("gaming-monitor", is_monitor=True)
-    all_products.extend(gaming_monitor_products)
+    context = SiteCrawlContext("altajit", BASE_URL_ALTAJIT)
     
-    # RAM/Memory
-    ram_products = scrape_altajit_collection("memory-ram", is_ram=True)
-    all_products.extend(ram_products)
-    
-    # Fans/Cooling
-    cooler_products = scrape_altajit_collection("fans-cooling", is_cooler=True)
-    all_products.extend(cooler_products)
-    
-    # Computer Cases
-    case_products = scrape_altajit_collection("computer-cases", is_case=True)
-    all_products.extend(case_products)
-    
-    # Motherboards
-    motherboard_products = scrape_altajit_collection("motherboards", is_motherboard=True)
-    all_products.extend(motherboard_products)
-    
-    # Power Supplies
-    psu_products = scrape_altajit_collection("power-supplies", is_power_supply=True)
-    all_products.extend(psu_products)
-    
-    # Storage (internal + external)
-    internal_storage_products = scrape_altajit_collection("internal-hard-drives", is_storage=True)
-    all_products.extend(internal_storage_products)
-    
-    external_storage_products = scrape_altajit_collection("external-hddssd", is_storage=True)
-    all_products.extend(external_storage_products)
-    
-    # CPUs
-    cpu_products = scrape_altajit_collection("cpus-processors", is_cpu=True)
-    all_products.extend(cpu_products)
-    
-    # Keyboards
-    keyboard_products = scrape_altajit_collection("keyboards", is_keyboard=True)
-    all_products.extend(keyboard_products)
-    
-    # Mice
-    mouse_products = scrape_altajit_collection("mouse", is_mouse=True)
-    all_products.extend(mouse_products)
-    
-    # Headphones/Headsets
-    headset_products = scrape_altajit_collection("headphones", is_headset=True)
-    all_products.extend(headset_products)
-    
-    print(f"Altajit scraped: {len(all_products)} products")
-    
-    # Remove duplicates based on product ID
-    seen_ids = set()
-    unique_products = []
+    # All collections at once on the shared scheduler
+    collection_products = context.run_concurrently(
+        lambda collection: scrape_altajit_collection(context, collection[0], **{collection[1]: True}),
+        ALTAJIT_COLLECTIONS.items()
+    )
     
-    for product in all_products:
-        product_id = product.get('id')
-        if product_id not in seen_ids:
-            seen_ids.add(product_id)
-            unique_products.append(product)
+    # Products listed in several collections are registered once; registering in
+    # table order keeps the first collection winning regardless of timing
+    for products in collection_products:
+        for product in products or []:
+            context.add(product)
     
-    return unique_products
+    print(f"Altajit scraped: {len(context.products)} products")
+    context.report()
+    return context.products
 
 # -------------------- Main Functions --------------------
+# Site name (as main.py knows it) -> homepage visited during the warm-up phase
+SITE_BASE_URLS = {
+    "globaliraq": BASE_URL_GLOBAL,
+    "alityan": BASE_URL_ALITYAN,
+    "kolshzin": BASE_URL_KOLSHZIN,
+    "3d-iraq": BASE_URL_3DIRAQ,
+    "jokercenter": BASE_URL_JOKERCENTER,
+    "almanjam": BASE_URL_ALMANJAM,
+    "spniq": BASE_URL_SPNIQ,
+    "altajit": BASE_URL_ALTAJIT,
+    "galaxyiq": BASE_URL_GALAXYIQ,
+}
+
+def warm_up_sites(site_names: List[str] = None) -> int:
+    """Resolve DNS, open pooled connections and prime cookies for the given sites (default: all) concurrently"""
+    urls = [SITE_BASE_URLS[name] for name in (site_names or SITE_BASE_URLS) if name in SITE_BASE_URLS]
+    return warm_up(urls) if urls else 0
+
 def scrape_site_individually(site_name: str) -> List[Dict]:
     """Scrape a single site and return its products"""
     if site_name.lower() == "globaliraq":
@@ -3730,6 +2160,8 @@ def scrape_site_individually(site_name: str) -> List[Dict]:
         return get_products_from_altajit()
     elif site_name.lower() == "spniq":
         return get_products_from_spniq()
+    elif site_name.lower() == "galaxyiq":
+        return get_products_from_galaxyiq()
     else:
         return []
 